@@ -3,8 +3,9 @@ Dungeon generation and management
 """
 
 import random
+from collections import deque
 from enum import Enum
-from typing import List, Tuple, Optional
+from typing import Dict, List, Optional
 
 from .entities import Entity, EntityType, Item, Position, SpellType
 
@@ -17,14 +18,29 @@ class CellType(Enum):
     STAIRS_DOWN = '▼'
 
 
+# Small integer codes for each cell type, used by Dungeon.grid_codes
+CELL_CODES = {cell_type: code for code, cell_type in enumerate(CellType)}
+WALL_CODE = CELL_CODES[CellType.WALL]
+FLOOR_CODE = CELL_CODES[CellType.FLOOR]
+STAIRS_DOWN_CODE = CELL_CODES[CellType.STAIRS_DOWN]
+
+# Entity types driven by the monster AI
+MONSTER_TYPES = frozenset((EntityType.GOBLIN, EntityType.ORC))
+
+
 class Dungeon:
     def __init__(self, width: int = 80, height: int = 24, level: int = 1):
         self.width = width
         self.height = height
         self.level = level
         self.grid = [[CellType.WALL for _ in range(width)] for _ in range(height)]
+        # Flat row-major copy of the grid as cell codes, for hot rendering loops
+        self.grid_codes = bytearray([WALL_CODE]) * (width * height)
         self.entities: List[Entity] = []
-        self.items: List[Tuple[Position, Item]] = []
+        # Hostile subset of entities, in the same order - dead ones are pruned each turn
+        self.monsters: List[Entity] = []
+        # Items on the floor by position - at most one per cell
+        self.items: Dict[Position, Item] = {}
         self.player: Optional[Entity] = None
         self.stairs_pos: Optional[Position] = None
         
@@ -95,6 +111,7 @@ class Dungeon:
             self.grid[self.stairs_pos.y][self.stairs_pos.x] = CellType.STAIRS_DOWN
         
         # Place monsters and items in other rooms (but not the last room with stairs)
+        magic_system = None
         for room in rooms[1:-1]:  # Skip first room (player) and last room (stairs)
             x, y, w, h = room
             
@@ -119,6 +136,7 @@ class Dungeon:
                     xp_value=random.randint(5, 15) + (self.level - 1) * 3
                 )
                 self.entities.append(monster)
+                self.monsters.append(monster)
             
             # Place items (50% chance)
             if random.random() < 0.5:
@@ -147,9 +165,10 @@ class Dungeon:
                         defense_bonus = base_defense + max(0, (self.level - 2))
                         item = Item(shield_name, item_type, value=defense_bonus * 7, defense_bonus=defense_bonus)
                     elif item_type == EntityType.SPELLBOOK:
-                        # Create spellbook using magic system
-                        from .magic import MagicSystem
-                        magic_system = MagicSystem()
+                        # Create spellbook using magic system, built at most once per floor
+                        if magic_system is None:
+                            from .magic import MagicSystem
+                            magic_system = MagicSystem()
                         available_spells = list(SpellType)
                         spell_type = random.choice(available_spells)
                         item = magic_system.create_spellbook(spell_type, self.level)
@@ -157,7 +176,42 @@ class Dungeon:
                         gold_amount = random.randint(3, 15) + (self.level - 1) * 5
                         item = Item("Gold Coins", item_type, value=gold_amount)
                     
-                    self.items.append((item_pos, item))
+                    # Rooms can overlap - the first item placed in a cell keeps it
+                    self.items.setdefault(item_pos, item)
+        
+        self.build_grid_codes()
+    
+    def build_grid_codes(self):
+        """Rebuild grid_codes from grid - call after the layout changes"""
+        self.grid_codes = bytearray(CELL_CODES[cell] for row in self.grid for cell in row)
+    
+    def distance_map(self, origin: Position) -> List[Optional[int]]:
+        """Walking distance from origin to every floor cell, moving in 8 directions
+        
+        Returns a flat row-major list like grid_codes, with None for cells that
+        can't be reached. Entities don't block - they move every turn.
+        """
+        width = self.width
+        height = self.height
+        grid_codes = self.grid_codes
+        distances = [None] * (width * height)
+        start = origin.y * width + origin.x
+        distances[start] = 0
+        frontier = deque([(origin.x, origin.y)])
+        while frontier:
+            x, y = frontier.popleft()
+            next_distance = distances[y * width + x] + 1
+            for ny in (y - 1, y, y + 1):
+                if not 0 <= ny < height:
+                    continue
+                for nx in (x - 1, x, x + 1):
+                    if not 0 <= nx < width:
+                        continue
+                    index = ny * width + nx
+                    if distances[index] is None and grid_codes[index] == FLOOR_CODE:
+                        distances[index] = next_distance
+                        frontier.append((nx, ny))
+        return distances
     
     def get_cell(self, pos: Position) -> CellType:
         if 0 <= pos.x < self.width and 0 <= pos.y < self.height:
@@ -165,20 +219,26 @@ class Dungeon:
         return CellType.WALL
     
     def is_walkable(self, pos: Position) -> bool:
-        return self.get_cell(pos) == CellType.FLOOR
+        return self.is_walkable_xy(pos.x, pos.y)
+    
+    def is_walkable_xy(self, x: int, y: int) -> bool:
+        """is_walkable for raw coordinates, read from grid_codes"""
+        return (0 <= x < self.width and 0 <= y < self.height and 
+                self.grid_codes[y * self.width + x] == FLOOR_CODE)
     
     def get_entity_at(self, pos: Position) -> Optional[Entity]:
+        return self.get_entity_at_xy(pos.x, pos.y)
+    
+    def get_entity_at_xy(self, x: int, y: int) -> Optional[Entity]:
+        """get_entity_at for raw coordinates"""
         for entity in self.entities:
-            if entity.pos.x == pos.x and entity.pos.y == pos.y:
+            pos = entity.pos
+            if pos.x == x and pos.y == y:
                 return entity
         return None
     
     def get_item_at(self, pos: Position) -> Optional[Item]:
-        for item_pos, item in self.items:
-            if item_pos.x == pos.x and item_pos.y == pos.y:
-                return item
-        return None
+        return self.items.get(pos)
     
     def remove_item_at(self, pos: Position):
-        self.items = [(item_pos, item) for item_pos, item in self.items 
-                      if not (item_pos.x == pos.x and item_pos.y == pos.y)]
\ No newline at end of file
+        self.items.pop(pos, None)
\ No newline at end of file
@@ -2,9 +2,14 @@
 Game entities: Items, Entities, and related data structures
 """
 
+import sys
 from enum import Enum
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
+
+# Slotted dataclasses (Python 3.10+) drop the per-instance __dict__, making
+# the many Items created during generation and loading smaller
+SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
 
 class EntityType(Enum):
@@ -30,8 +35,8 @@ class SpellType(Enum):
     POISON_CLOUD = "poison_cloud"
 
 
-@dataclass
-class Position:
+class Position(NamedTuple):
+    """A grid coordinate - immutable and hashable, so it can key a dict"""
     x: int
     y: int
     
@@ -39,7 +44,7 @@ class Position:
         return Position(self.x + other.x, self.y + other.y)
 
 
-@dataclass
+@dataclass(**SLOTS)
 class Item:
     name: str
     type: EntityType
@@ -50,7 +55,7 @@ class Item:
     spell_type: Optional['SpellType'] = None  # For spellbooks
 
 
-@dataclass
+@dataclass(**SLOTS)
 class Spell:
     spell_type: SpellType
     name: str
@@ -64,7 +69,7 @@ class Spell:
     duration: int = 0  # For temporary effects
 
 
-@dataclass
+@dataclass(eq=False, **SLOTS)
 class Entity:
     pos: Position
     type: EntityType
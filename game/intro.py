@@ -3,6 +3,7 @@ Intro screen with animations for AIRogue
 """
 
 import curses
+import math
 import time
 import random
 
@@ -101,8 +102,8 @@ class IntroScreen:
             
             # Floating movement with sine waves
             time_offset = time.time() - self.start_time + i * 0.5
-            offset_x = int(2 * __import__('math').sin(time_offset * 0.8))
-            offset_y = int(1.5 * __import__('math').cos(time_offset * 0.6 + i))
+            offset_x = int(2 * math.sin(time_offset * 0.8))
+            offset_y = int(1.5 * math.cos(time_offset * 0.6 + i))
             
             float_x = base_x + offset_x
             float_y = base_y + offset_y
@@ -149,7 +150,7 @@ class IntroScreen:
     
     def draw(self):
         """Draw the complete intro screen"""
-        self.stdscr.clear()
+        self.stdscr.erase()
         
         # Get screen dimensions
         height, width = self.stdscr.getmaxyx()
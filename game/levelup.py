@@ -21,13 +21,20 @@ class LevelingSystem:
         else:
             return int(50 + (current_level - 1) * 25)  # Level 2: 75, Level 3: 100, etc.
     
+    @staticmethod
+    def total_xp_for_level(level: int) -> int:
+        """Total XP needed to reach a level from level 1
+        
+        Closed form of summing xp_for_next_level over the levels below - each
+        level costs 25 XP more than the one before, starting at 50.
+        """
+        levels = level - 1
+        return 50 * levels + 25 * levels * (levels - 1) // 2
+    
     @staticmethod
     def get_xp_progress(total_xp: int, current_level: int) -> int:
         """Calculate how much XP the player has towards their next level"""
-        xp_spent = 0
-        for level in range(1, current_level):
-            xp_spent += LevelingSystem.xp_for_next_level(level)
-        return total_xp - xp_spent
+        return total_xp - LevelingSystem.total_xp_for_level(current_level)
     
     @staticmethod
     def calculate_level_from_xp(total_xp: int) -> int:
@@ -197,7 +197,7 @@ class MagicSystem:
         
         # Find target entity
         target = self._find_entity_at_position(dungeon, target_pos)
-        if target and target != caster:
+        if target and target is not caster:
             damage = spell.damage + random.randint(-2, 2)  # Add some variance
             target.hp -= damage
             
@@ -216,7 +216,7 @@ class MagicSystem:
             return f"{spell.name} is out of range!"
         
         target = self._find_entity_at_position(dungeon, target_pos)
-        if target and target != caster:
+        if target and target is not caster:
             if spell.status_effect:
                 self._apply_status_effect(target, spell.status_effect, spell.duration)
                 return f"{target.name} is affected by {spell.name}!"
@@ -242,7 +242,7 @@ class MagicSystem:
                 check_pos = type(target_pos)(target_pos.x + dx, target_pos.y + dy)
                 target = self._find_entity_at_position(dungeon, check_pos)
                 
-                if target and target != caster:
+                if target and target is not caster:
                     if spell.damage > 0:
                         target.hp -= spell.damage
                     
@@ -4,8 +4,24 @@
 
 import math
 import curses
+import re
+from array import array
 from game.entities import EntityType
-from game.dungeon import CellType
+from game.dungeon import CellType, WALL_CODE, STAIRS_DOWN_CODE
+
+
+def normalize_angle(angle):
+    """Wrap an angle into the [-pi, pi) range"""
+    return (angle + math.pi) % (2 * math.pi) - math.pi
+
+
+def sprite_runs(sprite):
+    """Split ASCII art rows into (row, column, text) runs of non-blank characters"""
+    runs = []
+    for y, row in enumerate(sprite):
+        for match in re.finditer(r'[^ ]+', row):
+            runs.append((y, match.start(), match.group()))
+    return runs
 
 
 class Renderer3D:
@@ -17,9 +33,73 @@ class Renderer3D:
         self.fov = math.pi / 3  # 60 degrees field of view
         self.max_depth = 20     # Maximum ray distance
         self.wall_height = 15   # Base wall height multiplier (increased for better scaling)
+        self.step_size = 0.1    # Ray marching step
         
-        # ASCII characters for different distances (closer = denser, farther = lighter)
-        self.wall_chars = ['█', '▉', '▊', '▋', '▌', '▍', '▎', '▏', '|', ':', '.', ' ']
+        # Rays advance in fixed steps, so a hit distance is just a step count.
+        # Precompute the distance reached after each step (accumulated the same
+        # way the ray does) and the wall heights for those distances.
+        self._step_distance = [0.0]
+        distance = 0
+        while distance < self.max_depth:
+            distance += self.step_size
+            self._step_distance.append(distance)
+        self._max_steps = len(self._step_distance) - 1
+        self._step_distance[self._max_steps] = self.max_depth
+        self._wall_height_lut = [int(self.wall_height * self.height / max(d * 3.0, 2.0))
+                                 for d in self._step_distance]
+        self._stairs_height_lut = [int(self.wall_height * self.height / max(d, 0.5) * 0.3)
+                                   for d in self._step_distance]
+        
+        # Per-column ray results for the current frame (quantized distance + hit type)
+        self._qdist = array('h', [0]) * self.width
+        # Angle of each column's ray relative to the left edge of the view
+        self._column_offsets = [(x / self.width) * self.fov for x in range(self.width)]
+        self._hit_type = [CellType.FLOOR] * self.width
+        self._ray_angles = [0.0] * self.width
+        self._cast_camera = None  # (x, y, angle) the column results were cast from
+        self._cast_grid = None    # grid_codes buffer they were cast against
+        
+        # Frame buffer - columns are rendered here and written out row by row
+        self._frame_chars = [[' '] * self.width for _ in range(self.height)]
+        self._frame_attrs = [[0] * self.width for _ in range(self.height)]
+        self._drawables = {}
+        
+        # Weapon/shield sprites as drawable runs, cached by item name
+        self._weapon_runs = {}
+        self._shield_runs = {}
+        
+        # 3D UI text lines and the values they were built from
+        self._ui_key = None
+        self._ui_lines = []
+        
+        # Sprite footprint for a sprite a given number of tiles away:
+        # (half width in columns, first row, end row)
+        self._entity_sprite_lut = []
+        self._item_sprite_lut = []
+        for step in range(int(self.max_depth) + 1):
+            sprite_height = max(2, int(8 * self.height / max(step * 2, 1.0)))
+            sprite_start = max(0, (self.height - sprite_height) // 2)
+            self._entity_sprite_lut.append((max(1, 6 - step) // 2, sprite_start,
+                                            min(self.height, sprite_start + sprite_height)))
+            sprite_height = max(1, int(4 * self.height / max(step * 2, 1.0)))
+            sprite_start = max(0, self.height - sprite_height - 2)
+            self._item_sprite_lut.append((max(1, 4 - step) // 2, sprite_start,
+                                          min(self.height - 2, sprite_start + sprite_height)))
+        # Beyond this many tiles sprites are one column wide and only show on the
+        # column whose ray passes exactly through their center
+        self._sprite_reach = max(step for step in range(len(self._entity_sprite_lut))
+                                 if self._entity_sprite_lut[step][0] > 0 or
+                                 self._item_sprite_lut[step][0] > 0)
+        self._max_sprite_half_width = max(half for half, _, _ in
+                                          self._entity_sprite_lut + self._item_sprite_lut)
+        
+        # Bold color attributes for sprites and the held weapon/shield, built once
+        self._sprite_attrs = {entity_type: self.get_entity_color(entity_type) | curses.A_BOLD
+                              for entity_type in EntityType}
+        self._weapon_attr = curses.color_pair(6) | curses.A_BOLD if curses.has_colors() else curses.A_BOLD
+        self._shield_attr = curses.color_pair(4) | curses.A_BOLD if curses.has_colors() else curses.A_BOLD  # Green for shields
+        
+        # Characters for the floor and ceiling around walls
         self.floor_char = '.'
         self.ceiling_char = ' '
         
@@ -30,48 +110,76 @@ class Renderer3D:
             curses.init_pair(17, curses.COLOR_WHITE, curses.COLOR_BLACK)   # Medium-close walls
             curses.init_pair(18, curses.COLOR_BLACK, curses.COLOR_BLACK)   # Far walls (dark)
             curses.init_pair(19, curses.COLOR_GREEN, curses.COLOR_BLACK)   # Floor
+        
+        # Column attributes, resolved once - wall shading by step count
+        self._wall_attr_lut = [self.get_wall_color(d) for d in self._step_distance]
+        self._floor_attr = curses.color_pair(19) if curses.has_colors() else 0
+        self._stairs_attr = curses.color_pair(6) | curses.A_BOLD if curses.has_colors() else curses.A_BOLD
     
     def cast_ray(self, dungeon, start_x, start_y, angle):
-        """Cast a ray and return distance to nearest wall and wall type"""
-        step_size = 0.1
-        distance = 0
-        
-        dx = math.cos(angle) * step_size
-        dy = math.sin(angle) * step_size
-        
-        x, y = start_x, start_y
-        
-        while distance < self.max_depth:
-            x += dx
-            y += dy
-            distance += step_size
+        """Cast a ray and return the number of steps to the nearest wall and wall type
+        
+        Walks the grid cell by cell (DDA) instead of marching in fixed steps,
+        then reports the hit as the first ray-march step past the wall edge.
+        """
+        ray_dx = math.cos(angle)
+        ray_dy = math.sin(angle)
+        
+        grid_codes = dungeon.grid_codes
+        map_width = dungeon.width
+        map_height = dungeon.height
+        map_x = int(start_x)
+        map_y = int(start_y)
+        
+        # Ray length to cross one cell along each axis, and to the first crossing
+        delta_x = abs(1.0 / ray_dx) if ray_dx else math.inf
+        delta_y = abs(1.0 / ray_dy) if ray_dy else math.inf
+        if ray_dx < 0:
+            step_x = -1
+            side_x = (start_x - map_x) * delta_x
+        else:
+            step_x = 1
+            side_x = (map_x + 1.0 - start_x) * delta_x
+        if ray_dy < 0:
+            step_y = -1
+            side_y = (start_y - map_y) * delta_y
+        else:
+            step_y = 1
+            side_y = (map_y + 1.0 - start_y) * delta_y
+        
+        max_depth = self.max_depth
+        step_size = self.step_size
+        max_steps = self._max_steps
+        
+        while True:
+            # Advance to the next cell boundary along whichever axis is nearer
+            if side_x < side_y:
+                distance = side_x
+                side_x += delta_x
+                map_x += step_x
+            else:
+                distance = side_y
+                side_y += delta_y
+                map_y += step_y
             
-            # Check bounds
-            map_x = int(x)
-            map_y = int(y)
+            if distance >= max_depth:
+                break
             
-            if (map_x < 0 or map_x >= dungeon.width or 
-                map_y < 0 or map_y >= dungeon.height):
-                return distance, CellType.WALL
+            steps = min(int(distance / step_size) + 1, max_steps)
+            
+            # Check bounds
+            if (map_x < 0 or map_x >= map_width or 
+                map_y < 0 or map_y >= map_height):
+                return steps, CellType.WALL
             
             # Check for wall
-            cell_type = dungeon.grid[map_y][map_x]
-            if cell_type == CellType.WALL:
-                return distance, CellType.WALL
-            elif cell_type == CellType.STAIRS_DOWN:
-                return distance, CellType.STAIRS_DOWN
+            cell_code = grid_codes[map_y * map_width + map_x]
+            if cell_code == WALL_CODE:
+                return steps, CellType.WALL
+            elif cell_code == STAIRS_DOWN_CODE:
+                return steps, CellType.STAIRS_DOWN
         
-        return self.max_depth, CellType.FLOOR
-    
-    def get_wall_char(self, distance):
-        """Get ASCII character based on distance"""
-        if distance >= self.max_depth:
-            return ' '
-        
-        # Map distance to character index
-        char_index = int((distance / self.max_depth) * (len(self.wall_chars) - 1))
-        char_index = max(0, min(len(self.wall_chars) - 1, char_index))
-        return self.wall_chars[char_index]
+        return self._max_steps, CellType.FLOOR
     
     def get_wall_color(self, distance):
         """Get grayscale color based on distance"""
@@ -88,155 +196,178 @@ class Renderer3D:
         else:
             return curses.color_pair(18)  # Very far: black/dark
     
-    def render_column(self, x, distance, wall_type=CellType.WALL):
-        """Render a single vertical column at screen position x"""
+    def render_column(self, x, steps, wall_type=CellType.WALL):
+        """Render a single vertical column at screen position x into the frame buffer"""
+        distance = self._step_distance[steps]
+        frame_chars = self._frame_chars
+        frame_attrs = self._frame_attrs
+        height = self.height
+        ceiling_char = self.ceiling_char
+        floor_char = self.floor_char
+        
         # Don't render walls that are too far away - only show them when closer
         wall_visibility_limit = 6  # Walls invisible beyond 6 tiles
         
         if distance >= wall_visibility_limit:
             # Render empty space for distant walls
-            for y in range(self.height):
-                try:
-                    self.stdscr.addch(y, x, ' ')
-                except curses.error:
-                    pass
+            for y in range(height):
+                frame_chars[y][x] = ' '
+                frame_attrs[y][x] = 0
             return
         
         # Special handling for stairs - render as lower walls with stairs pattern
         if wall_type == CellType.STAIRS_DOWN:
             # Stairs appear as shorter walls with stair pattern
-            wall_height = int(self.wall_height * self.height / max(distance, 0.5) * 0.3)  # 30% height
-            wall_start = max(0, self.height - wall_height - 3)  # Bottom aligned
-            wall_end = min(self.height - 3, wall_start + wall_height)  # Leave space for floor
+            wall_height = self._stairs_height_lut[steps]  # 30% height
+            wall_start = max(0, height - wall_height - 3)  # Bottom aligned
+            wall_end = min(height - 3, wall_start + wall_height)  # Leave space for floor
             
             stairs_char = '▼'
-            stairs_color = curses.color_pair(6) | curses.A_BOLD if curses.has_colors() else curses.A_BOLD
-            floor_color = curses.color_pair(19) if curses.has_colors() else 0
+            stairs_color = self._stairs_attr
+            floor_color = self._floor_attr
             
-            for y in range(self.height):
-                try:
-                    if y < wall_start:
-                        # Ceiling
-                        self.stdscr.addch(y, x, self.ceiling_char)
-                    elif y < wall_end:
-                        # Stairs pattern
-                        if (y - wall_start) % 2 == 0:
-                            self.stdscr.addch(y, x, stairs_char, stairs_color)
-                        else:
-                            self.stdscr.addch(y, x, '═', stairs_color)
+            for y in range(height):
+                if y < wall_start:
+                    # Ceiling
+                    frame_chars[y][x] = ceiling_char
+                    frame_attrs[y][x] = 0
+                elif y < wall_end:
+                    # Stairs pattern
+                    if (y - wall_start) % 2 == 0:
+                        frame_chars[y][x] = stairs_char
                     else:
-                        # Floor
-                        self.stdscr.addch(y, x, self.floor_char, floor_color)
-                except curses.error:
-                    pass
+                        frame_chars[y][x] = '═'
+                    frame_attrs[y][x] = stairs_color
+                else:
+                    # Floor
+                    frame_chars[y][x] = floor_char
+                    frame_attrs[y][x] = floor_color
         else:
             # Normal wall rendering with much more accurate distance scaling
             # Walls should only fill screen when very close, scale down rapidly with distance
-            wall_height = int(self.wall_height * self.height / max(distance * 3.0, 2.0))
-            wall_start = max(0, (self.height - wall_height) // 2)
-            wall_end = min(self.height, wall_start + wall_height)
+            wall_height = self._wall_height_lut[steps]
+            wall_start = max(0, (height - wall_height) // 2)
+            wall_end = min(height, wall_start + wall_height)
             
-            wall_char = self.get_wall_char(distance)
-            wall_color = self.get_wall_color(distance)
-            floor_color = curses.color_pair(19) if curses.has_colors() else 0
+            wall_color = self._wall_attr_lut[steps]
+            floor_color = self._floor_attr
             
-            for y in range(self.height):
-                try:
-                    if y < wall_start:
-                        # Ceiling
-                        self.stdscr.addch(y, x, self.ceiling_char)
-                    elif y < wall_end:
-                        # Wall with density-based character that changes based on distance
-                        # Use different characters for texture variation on the same wall
-                        texture_variation = (y + x) % 3
-                        if distance < 1.5:
-                            # Very close - use solid block
-                            render_char = '█'
-                        elif distance < 3.0:
-                            # Close - dense patterns
-                            chars = ['█', '▉', '▊']
-                            render_char = chars[texture_variation]
-                        elif distance < 4.5:
-                            # Medium - medium density
-                            chars = ['▋', '▌', '▍']
-                            render_char = chars[texture_variation]
-                        else:
-                            # Far - light patterns (up to 6 tiles)
-                            chars = ['▎', '▏', '|']
-                            render_char = chars[texture_variation]
-                        
-                        self.stdscr.addch(y, x, render_char, wall_color)
-                    else:
-                        # Floor
-                        self.stdscr.addch(y, x, self.floor_char, floor_color)
-                except curses.error:
-                    pass
+            # The texture set depends only on distance, so pick it once per column
+            if distance < 1.5:
+                # Very close - use solid block
+                wall_chars = ('█', '█', '█')
+            elif distance < 3.0:
+                # Close - dense patterns
+                wall_chars = ('█', '▉', '▊')
+            elif distance < 4.5:
+                # Medium - medium density
+                wall_chars = ('▋', '▌', '▍')
+            else:
+                # Far - light patterns (up to 6 tiles)
+                wall_chars = ('▎', '▏', '|')
+            
+            for y in range(height):
+                if y < wall_start:
+                    # Ceiling
+                    frame_chars[y][x] = ceiling_char
+                    frame_attrs[y][x] = 0
+                elif y < wall_end:
+                    # Wall with density-based character that changes based on distance
+                    # Use different characters for texture variation on the same wall
+                    frame_chars[y][x] = wall_chars[(y + x) % 3]
+                    frame_attrs[y][x] = wall_color
+                else:
+                    # Floor
+                    frame_chars[y][x] = floor_char
+                    frame_attrs[y][x] = floor_color
     
-    def render_entities_on_column(self, x, dungeon, player_x, player_y, player_angle, ray_angle, distance):
+    def collect_drawables(self, dungeon):
+        """Index living monsters and floor items by grid position for this frame
+        
+        Each position maps to a list of (is_entity, char, color) in draw priority
+        order - entities before items, matching the order they were checked in.
+        """
+        drawables = {}
+        sprite_attrs = self._sprite_attrs
+        for entity in dungeon.entities:
+            if entity.hp <= 0 or entity.type == EntityType.PLAYER:
+                continue
+            drawables.setdefault((entity.pos.x, entity.pos.y), []).append(
+                (True, entity.type.value, sprite_attrs[entity.type]))
+        for item_pos, item in dungeon.items.items():
+            drawables.setdefault((item_pos.x, item_pos.y), []).append(
+                (False, item.type.value, sprite_attrs[item.type]))
+        return drawables
+    
+    def render_entities_on_column(self, x, player_x, player_y, player_angle, ray_angle, distance):
         """Render entities (monsters, items) on this column if they're visible"""
+        drawables = self._drawables
+        if not drawables:
+            return
+        
+        # Distance of this column from the sprite center column the ray points at
+        center_column = self.width * (ray_angle - player_angle + self.fov/2) / self.fov
+        column_offset = abs(x - center_column)
+        if column_offset > self._max_sprite_half_width:
+            return
+        last_step = int(distance)
+        if column_offset > 0:
+            last_step = min(last_step, self._sprite_reach)
+        
         # Simple grid-based approach - calculate which tile this ray is hitting
         ray_dx = math.cos(ray_angle)
         ray_dy = math.sin(ray_angle)
+        entity_sprite_lut = self._entity_sprite_lut
+        item_sprite_lut = self._item_sprite_lut
+        frame_chars = self._frame_chars
+        frame_attrs = self._frame_attrs
         
         # Step along the ray and check each grid cell
-        for step in range(1, int(distance) + 1):
+        for step in range(1, last_step + 1):
             grid_x = int(player_x + ray_dx * step)
             grid_y = int(player_y + ray_dy * step)
             
-            # Check all entities at this grid position
-            for entity in dungeon.entities:
-                if entity.hp <= 0 or entity.type == EntityType.PLAYER:
+            for is_entity, sprite_char, sprite_color in drawables.get((grid_x, grid_y), ()):
+                # Monsters stand in the middle of the view, items lie on the floor;
+                # closer sprites are wider
+                if is_entity:
+                    half_width, sprite_start, sprite_end = entity_sprite_lut[step]
+                else:
+                    half_width, sprite_start, sprite_end = item_sprite_lut[step]
+                
+                # Check if this column should show the sprite
+                if column_offset > half_width:
                     continue
-                    
-                if entity.pos.x == grid_x and entity.pos.y == grid_y:
-                    entity_distance = step
-                    
-                    # Simple width calculation - closer = wider
-                    sprite_width = max(1, 6 - entity_distance)
-                    
-                    # Check if this column should show the entity
-                    entity_center_column = self.width * (ray_angle - player_angle + self.fov/2) / self.fov
-                    if abs(x - entity_center_column) <= sprite_width // 2:
-                        # Render entity sprite
-                        sprite_height = max(2, int(8 * self.height / max(entity_distance * 2, 1.0)))
-                        sprite_start = max(0, (self.height - sprite_height) // 2)
-                        sprite_end = min(self.height, sprite_start + sprite_height)
-                        
-                        entity_char = entity.type.value
-                        entity_color = self.get_entity_color(entity.type) | curses.A_BOLD
-                        
-                        for y in range(sprite_start, sprite_end):
-                            try:
-                                self.stdscr.addch(y, x, entity_char, entity_color)
-                            except curses.error:
-                                pass
-                        return
-            
-            # Check all items at this grid position
-            for item_pos, item in dungeon.items:
-                if item_pos.x == grid_x and item_pos.y == grid_y:
-                    item_distance = step
-                    
-                    # Simple width calculation for items
-                    sprite_width = max(1, 4 - item_distance)
-                    
-                    # Check if this column should show the item
-                    item_center_column = self.width * (ray_angle - player_angle + self.fov/2) / self.fov
-                    if abs(x - item_center_column) <= sprite_width // 2:
-                        # Render item sprite
-                        sprite_height = max(1, int(4 * self.height / max(item_distance * 2, 1.0)))
-                        sprite_start = max(0, self.height - sprite_height - 2)
-                        sprite_end = min(self.height - 2, sprite_start + sprite_height)
-                        
-                        item_char = item.type.value
-                        item_color = self.get_entity_color(item.type) | curses.A_BOLD
-                        
-                        for y in range(sprite_start, sprite_end):
-                            try:
-                                self.stdscr.addch(y, x, item_char, item_color)
-                            except curses.error:
-                                pass
-                        return
+                
+                for y in range(sprite_start, sprite_end):
+                    frame_chars[y][x] = sprite_char
+                    frame_attrs[y][x] = sprite_color
+                return
+    
+    def flush_frame(self):
+        """Write the frame buffer to the screen, one addstr per run of cells sharing an attribute
+        
+        Expects the screen to have just been erased.
+        """
+        for y in range(self.height):
+            row_chars = self._frame_chars[y]
+            row_attrs = self._frame_attrs[y]
+            run_start = 0
+            run_attr = row_attrs[0]
+            for x in range(1, self.width + 1):
+                if x < self.width and row_attrs[x] == run_attr:
+                    continue
+                text = ''.join(row_chars[run_start:x])
+                # erase() already left the screen blank, so plain blank runs
+                # (open ceiling, walls beyond view distance) need no write
+                if run_attr or not text.isspace():
+                    try:
+                        self.stdscr.addstr(y, run_start, text, run_attr)
+                    except curses.error:
+                        pass
+                if x < self.width:
+                    run_start = x
+                    run_attr = row_attrs[x]
     
     def get_entity_color(self, entity_type):
         """Get color for entity type"""
@@ -290,7 +421,22 @@ class Renderer3D:
         except curses.error:
             pass
         
+        # Monster and item markers by position - items are drawn over monsters
+        marks = {}
+        for entity in dungeon.entities:
+            if entity.hp > 0:
+                if entity.type in [EntityType.GOBLIN, EntityType.ORC]:
+                    marks[(entity.pos.x, entity.pos.y)] = ('E', curses.color_pair(3) if curses.has_colors() else 0)  # Enemy
+                elif entity.type == EntityType.SHOPKEEPER:
+                    marks[(entity.pos.x, entity.pos.y)] = ('S', curses.color_pair(10) if curses.has_colors() else 0)
+        for item_pos, item in dungeon.items.items():
+            if item.type == EntityType.GOLD:
+                marks[(item_pos.x, item_pos.y)] = ('$', curses.color_pair(6) if curses.has_colors() else 0)
+            else:
+                marks[(item_pos.x, item_pos.y)] = ('?', curses.color_pair(4) if curses.has_colors() else 0)
+        
         # Draw minimap background
+        grid_codes = dungeon.grid_codes
         for my in range(map_size):
             for mx in range(map_size):
                 screen_x = map_start_x + mx
@@ -307,36 +453,21 @@ class Renderer3D:
                 color = 0
                 
                 if (0 <= world_x < dungeon.width and 0 <= world_y < dungeon.height):
-                    cell = dungeon.grid[world_y][world_x]
-                    if cell == CellType.WALL:
+                    cell_code = grid_codes[world_y * dungeon.width + world_x]
+                    if cell_code == WALL_CODE:
                         char = '█'
                         color = curses.color_pair(16) if curses.has_colors() else 0
-                    elif cell == CellType.STAIRS_DOWN:
+                    elif cell_code == STAIRS_DOWN_CODE:
                         char = '▼'
                         color = curses.color_pair(6) if curses.has_colors() else 0
                     else:
                         char = '·'
                         color = curses.color_pair(7) if curses.has_colors() else 0
                     
-                    # Check for entities at this position
-                    for entity in dungeon.entities:
-                        if entity.pos.x == world_x and entity.pos.y == world_y and entity.hp > 0:
-                            if entity.type in [EntityType.GOBLIN, EntityType.ORC]:
-                                char = 'E'  # Enemy
-                                color = curses.color_pair(3) if curses.has_colors() else 0
-                            elif entity.type == EntityType.SHOPKEEPER:
-                                char = 'S'
-                                color = curses.color_pair(10) if curses.has_colors() else 0
-                    
-                    # Check for items
-                    for item_pos, item in dungeon.items:
-                        if item_pos.x == world_x and item_pos.y == world_y:
-                            if item.type == EntityType.GOLD:
-                                char = '$'
-                                color = curses.color_pair(6) if curses.has_colors() else 0
-                            else:
-                                char = '?'
-                                color = curses.color_pair(4) if curses.has_colors() else 0
+                    # Monsters and items sit on top of the floor
+                    mark = marks.get((world_x, world_y))
+                    if mark:
+                        char, color = mark
                 
                 try:
                     self.stdscr.addch(screen_y, screen_x, char, color)
@@ -370,19 +501,17 @@ class Renderer3D:
         if sprite_x < 0 or sprite_y < 0 or sprite_x + weapon_width >= self.width:
             return
         
-        weapon_color = curses.color_pair(6) | curses.A_BOLD if curses.has_colors() else curses.A_BOLD
+        weapon_color = self._weapon_attr
         
         # Different weapon sprites based on weapon type/name - larger versions
-        weapon_sprite = self.get_weapon_sprite(player.weapon)
+        weapon_runs = self._weapon_runs.get(player.weapon.name)
+        if weapon_runs is None:
+            weapon_runs = sprite_runs(self.get_weapon_sprite(player.weapon))
+            self._weapon_runs[player.weapon.name] = weapon_runs
         
         try:
-            for y, row in enumerate(weapon_sprite):
-                if sprite_y + y >= self.height:
-                    break
-                for x, char in enumerate(row):
-                    if sprite_x + x >= self.width or char == ' ':
-                        continue
-                    self.stdscr.addch(sprite_y + y, sprite_x + x, char, weapon_color)
+            for y, x, text in weapon_runs:
+                self.stdscr.addstr(sprite_y + y, sprite_x + x, text, weapon_color)
         except curses.error:
             pass
     
@@ -485,19 +614,17 @@ class Renderer3D:
         if sprite_x < 0 or sprite_y < 0 or sprite_x + shield_width >= self.width:
             return
         
-        shield_color = curses.color_pair(4) | curses.A_BOLD if curses.has_colors() else curses.A_BOLD  # Green for shields
+        shield_color = self._shield_attr
         
         # Different shield sprites based on shield type/name
-        shield_sprite = self.get_shield_sprite(player.shield)
+        shield_runs = self._shield_runs.get(player.shield.name)
+        if shield_runs is None:
+            shield_runs = sprite_runs(self.get_shield_sprite(player.shield))
+            self._shield_runs[player.shield.name] = shield_runs
         
         try:
-            for y, row in enumerate(shield_sprite):
-                if sprite_y + y >= self.height:
-                    break
-                for x, char in enumerate(row):
-                    if sprite_x + x >= self.width or char == ' ':
-                        continue
-                    self.stdscr.addch(sprite_y + y, sprite_x + x, char, shield_color)
+            for y, x, text in shield_runs:
+                self.stdscr.addstr(sprite_y + y, sprite_x + x, text, shield_color)
         except curses.error:
             pass
     
@@ -578,57 +705,91 @@ class Renderer3D:
             return
         
         player = game.dungeon.player
-        ui_y = self.height - 3
+        
+        # The text only changes once per turn at most, so rebuild it only when
+        # one of the values shown changes
+        ui_key = (player.hp, player.max_hp, player.weapon.name if player.weapon else None,
+                  player.shield.name if player.shield else None, game.current_level, player.gold)
+        if ui_key != self._ui_key:
+            self._ui_key = ui_key
+            self._ui_lines = self.layout_ui(game, player)
         
         try:
             ui_color = curses.color_pair(8) if curses.has_colors() else 0
-            
-            # Health bar
-            hp_bar = f"HP: {player.hp}/{player.max_hp}"
-            self.stdscr.addstr(ui_y, 1, hp_bar, ui_color)
-            
-            # Weapon and shield info
-            if player.weapon:
-                weapon_info = f"Weapon: {player.weapon.name}"
-                self.stdscr.addstr(ui_y + 1, 1, weapon_info, ui_color)
-            
-            if player.shield:
-                shield_info = f"Shield: {player.shield.name}"
-                # Position shield info on the right side to match shield sprite
-                shield_x = self.width - len(shield_info) - 1
-                self.stdscr.addstr(ui_y + 1, shield_x, shield_info, ui_color)
-            
-            # Level and gold
-            level_info = f"Floor: {game.current_level} | Gold: {player.gold}"
-            self.stdscr.addstr(ui_y, self.width - len(level_info) - 1, level_info, ui_color)
-            
-            # Controls reminder
-            controls = "Arrows: Turn | WASD: Move | I: Inventory | Q: Quit"
-            if len(controls) < self.width:
-                self.stdscr.addstr(self.height - 1, 1, controls, ui_color)
-            
+            for y, x, text in self._ui_lines:
+                self.stdscr.addstr(y, x, text, ui_color)
         except curses.error:
             pass
     
+    def layout_ui(self, game, player):
+        """Build the 3D UI text as (y, x, text) lines"""
+        ui_y = self.height - 3
+        lines = []
+        
+        # Health bar
+        hp_bar = f"HP: {player.hp}/{player.max_hp}"
+        lines.append((ui_y, 1, hp_bar))
+        
+        # Weapon and shield info
+        if player.weapon:
+            weapon_info = f"Weapon: {player.weapon.name}"
+            lines.append((ui_y + 1, 1, weapon_info))
+        
+        if player.shield:
+            shield_info = f"Shield: {player.shield.name}"
+            # Position shield info on the right side to match shield sprite
+            shield_x = self.width - len(shield_info) - 1
+            lines.append((ui_y + 1, shield_x, shield_info))
+        
+        # Level and gold
+        level_info = f"Floor: {game.current_level} | Gold: {player.gold}"
+        lines.append((ui_y, self.width - len(level_info) - 1, level_info))
+        
+        # Controls reminder
+        controls = "Arrows: Turn | WASD: Move | I: Inventory | Q: Quit"
+        if len(controls) < self.width:
+            lines.append((self.height - 1, 1, controls))
+        
+        return lines
+    
     def render_scene(self, game, player_x, player_y, player_angle):
         """Render the complete 3D scene"""
-        self.stdscr.clear()
+        self.stdscr.erase()
         
         dungeon = game.dungeon
-        
-        # Cast rays for each column of the screen
-        for x in range(self.width):
-            # Calculate ray angle for this column
-            ray_angle = player_angle - self.fov/2 + (x / self.width) * self.fov
-            
-            # Cast ray
-            distance, wall_type = self.cast_ray(dungeon, player_x, player_y, ray_angle)
-            
+        width = self.width
+        cast_ray = self.cast_ray
+        render_column = self.render_column
+        render_entities_on_column = self.render_entities_on_column
+        step_distance = self._step_distance
+        self._drawables = self.collect_drawables(dungeon)
+        
+        # Cast rays for each column of the screen. Walls only depend on the camera
+        # and the layout, so frames where neither changed (monsters moving, menus
+        # opening) reuse the previous results.
+        qdist = self._qdist
+        hit_type = self._hit_type
+        ray_angles = self._ray_angles
+        camera = (player_x, player_y, player_angle)
+        if camera != self._cast_camera or dungeon.grid_codes is not self._cast_grid:
+            left_angle = player_angle - self.fov/2
+            column_offsets = self._column_offsets
+            for x in range(width):
+                # Calculate ray angle for this column
+                ray_angle = ray_angles[x] = left_angle + column_offsets[x]
+                qdist[x], hit_type[x] = cast_ray(dungeon, player_x, player_y, ray_angle)
+            self._cast_camera = camera
+            self._cast_grid = dungeon.grid_codes
+        
+        for x in range(width):
             # Render the column with wall type
-            self.render_column(x, distance, wall_type)
+            render_column(x, qdist[x], hit_type[x])
             
             # Render entities on this column
-            self.render_entities_on_column(x, dungeon, player_x, player_y, player_angle, ray_angle, distance)
+            render_entities_on_column(x, player_x, player_y, player_angle, ray_angles[x],
+                                      step_distance[qdist[x]])
+        
+        self.flush_frame()
         
         # Render UI elements
         self.render_minimap(dungeon, player_x, player_y, player_angle)
@@ -639,4 +800,5 @@ class Renderer3D:
             self.render_weapon_sprite(game.dungeon.player)
             self.render_shield_sprite(game.dungeon.player)
         
-        self.stdscr.refresh()
\ No newline at end of file
+        self.stdscr.noutrefresh()
+        curses.doupdate()
\ No newline at end of file
@@ -4,156 +4,216 @@ Save and load game functionality
 
 import json
 import os
+from operator import attrgetter
 from .entities import Entity, EntityType, Item, Position, SpellType, Spell
-from .dungeon import CellType, Dungeon
+from .dungeon import CellType, Dungeon, MONSTER_TYPES
 from .shop import Shop
 
+# orjson is an optional, much faster drop-in for the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pysimdjson is an optional, even faster parser used for loading
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+
+SAVE_PATH = 'savegame.json'
+# A save is written here first and then moved over SAVE_PATH
+TEMP_SAVE_PATH = SAVE_PATH + '.tmp'
+
+# Enum members by their saved value
+ENTITY_TYPES_BY_VALUE = {entity_type.value: entity_type for entity_type in EntityType}
+SPELL_TYPES_BY_VALUE = {spell_type.value: spell_type for spell_type in SpellType}
+CELL_TYPES_BY_VALUE = {cell_type.value: cell_type for cell_type in CellType}
+
+
+def item_to_dict(item):
+    """Serialize an Item to a JSON-friendly dict"""
+    spell_type = item.spell_type
+    return {
+        'name': item.name,
+        'type': item.type.value,
+        'value': item.value,
+        'attack_bonus': item.attack_bonus,
+        'defense_bonus': item.defense_bonus,
+        'heal_amount': item.heal_amount,
+        'spell_type': spell_type.value if spell_type else None
+    }
+
+
+def item_from_dict(item_data):
+    """Rebuild an Item from a dict written by item_to_dict"""
+    spell_type = None
+    if item_data.get('spell_type'):
+        spell_type = SPELL_TYPES_BY_VALUE.get(item_data['spell_type'])
+    
+    return Item(
+        name=item_data['name'],
+        type=ENTITY_TYPES_BY_VALUE.get(item_data['type']),
+        value=item_data['value'],
+        attack_bonus=item_data['attack_bonus'],
+        defense_bonus=item_data['defense_bonus'],
+        heal_amount=item_data['heal_amount'],
+        spell_type=spell_type
+    )
+
+
+def spell_to_dict(spell):
+    """Serialize a known Spell to a JSON-friendly dict"""
+    return {
+        'spell_type': spell.spell_type.value,
+        'name': spell.name,
+        'description': spell.description,
+        'mana_cost': spell.mana_cost,
+        'damage': spell.damage,
+        'heal_amount': spell.heal_amount,
+        'range': spell.range,
+        'area_effect': spell.area_effect,
+        'status_effect': spell.status_effect,
+        'duration': spell.duration
+    }
+
+
+def spell_from_dict(spell_data):
+    """Rebuild a Spell from a dict written by spell_to_dict"""
+    return Spell(
+        spell_type=SPELL_TYPES_BY_VALUE[spell_data['spell_type']],
+        name=spell_data['name'],
+        description=spell_data['description'],
+        mana_cost=spell_data['mana_cost'],
+        damage=spell_data.get('damage', 0),
+        heal_amount=spell_data.get('heal_amount', 0),
+        range=spell_data.get('range', 1),
+        area_effect=spell_data.get('area_effect', False),
+        status_effect=spell_data.get('status_effect'),
+        duration=spell_data.get('duration', 0)
+    )
+
+
+def entity_to_dict(entity):
+    """Serialize an Entity, including its inventory, spells and equipment"""
+    pos = entity.pos
+    weapon = entity.weapon
+    shield = entity.shield
+    weapon_data = item_to_dict(weapon) if weapon else None
+    return {
+        'pos': {'x': pos.x, 'y': pos.y},
+        'type': entity.type.value,
+        'hp': entity.hp,
+        'max_hp': entity.max_hp,
+        'attack': entity.attack,
+        'defense': entity.defense,
+        'name': entity.name,
+        'gold': entity.gold,
+        'xp': entity.xp,
+        'level': entity.level,
+        'xp_value': entity.xp_value,
+        'inventory': [item_to_dict(item) for item in entity.inventory],
+        'weapon': weapon_data,
+        'shield': item_to_dict(shield) if shield else None,
+        'equipment': weapon_data,  # Backwards compatibility - an alias of the weapon
+        'mana': entity.mana,
+        'max_mana': entity.max_mana,
+        'angle': entity.angle,
+        'known_spells': [spell_to_dict(spell) for spell in entity.known_spells],
+        'active_effects': entity.active_effects
+    }
+
+
+def dump_json(value):
+    """Encode a value as compact JSON bytes"""
+    if orjson:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+def write_json_object(f, members):
+    """Write (key, value) pairs to f as the inside of a JSON object"""
+    f.write(b','.join(dump_json(key) + b':' + dump_json(value) for key, value in members))
+
+
+def write_json_array(f, values):
+    """Write an iterable to f as a JSON array, encoding one element at a time"""
+    f.write(b'[')
+    for index, value in enumerate(values):
+        if index:
+            f.write(b',')
+        f.write(dump_json(value))
+    f.write(b']')
+
+
+def parse_save_data(raw_data):
+    """Parse save file bytes with the fastest available JSON parser"""
+    if simdjson:
+        # recursive=True returns plain dicts/lists rather than lazy proxies
+        return simdjson.Parser().parse(raw_data, recursive=True)
+    if orjson:
+        return orjson.loads(raw_data)
+    return json.loads(raw_data)
+
 
 class SaveLoadSystem:
     @staticmethod
     def save_game(game):
         """Save the current game state to a JSON file"""
         try:
-            # Convert game state to serializable format
-            save_data = {
-                'dungeon': {
-                    'width': game.dungeon.width,
-                    'height': game.dungeon.height,
-                    'level': game.dungeon.level,
-                    'grid': [[cell.value for cell in row] for row in game.dungeon.grid],
-                    'entities': [],
-                    'items': [],
-                    'stairs_pos': {'x': game.dungeon.stairs_pos.x, 'y': game.dungeon.stairs_pos.y} if game.dungeon.stairs_pos else None
-                },
-                'messages': game.messages,
-                'game_over': game.game_over,
-                'current_level': game.current_level,
-                'in_shop': game.in_shop
-            }
+            dungeon = game.dungeon
+            cell_value = attrgetter('value')
             
-            # Save entities
-            for entity in game.dungeon.entities:
-                entity_data = {
-                    'pos': {'x': entity.pos.x, 'y': entity.pos.y},
-                    'type': entity.type.value,
-                    'hp': entity.hp,
-                    'max_hp': entity.max_hp,
-                    'attack': entity.attack,
-                    'defense': entity.defense,
-                    'name': entity.name,
-                    'gold': entity.gold,
-                    'xp': entity.xp,
-                    'level': entity.level,
-                    'xp_value': entity.xp_value,
-                    'inventory': [],
-                    'equipment': None,
-                    'mana': entity.mana,
-                    'max_mana': entity.max_mana,
-                    'angle': entity.angle,
-                    'known_spells': [],
-                    'active_effects': entity.active_effects
-                }
-                
-                # Save inventory
-                for item in entity.inventory:
-                    item_data = {
-                        'name': item.name,
-                        'type': item.type.value,
-                        'value': item.value,
-                        'attack_bonus': item.attack_bonus,
-                        'defense_bonus': item.defense_bonus,
-                        'heal_amount': item.heal_amount,
-                        'spell_type': item.spell_type.value if item.spell_type else None
-                    }
-                    entity_data['inventory'].append(item_data)
-                
-                # Save known spells
-                for spell in entity.known_spells:
-                    entity_data['known_spells'].append({
-                        'spell_type': spell.spell_type.value,
-                        'name': spell.name,
-                        'description': spell.description,
-                        'mana_cost': spell.mana_cost,
-                        'damage': spell.damage,
-                        'heal_amount': spell.heal_amount,
-                        'range': spell.range,
-                        'area_effect': spell.area_effect,
-                        'status_effect': spell.status_effect,
-                        'duration': spell.duration
-                    })
-                
-                # Save weapon
-                if entity.weapon:
-                    entity_data['weapon'] = {
-                        'name': entity.weapon.name,
-                        'type': entity.weapon.type.value,
-                        'value': entity.weapon.value,
-                        'attack_bonus': entity.weapon.attack_bonus,
-                        'defense_bonus': entity.weapon.defense_bonus,
-                        'heal_amount': entity.weapon.heal_amount,
-                        'spell_type': entity.weapon.spell_type.value if entity.weapon.spell_type else None
-                    }
-                else:
-                    entity_data['weapon'] = None
+            # Stream the save to disk piece by piece so that only one entity's
+            # data is held in memory at a time. Written compact - the file is
+            # only read back by load_game. It goes to a temporary file that
+            # replaces the old save only once complete, so a failed save never
+            # destroys the last good one.
+            with open(TEMP_SAVE_PATH, 'wb') as f:
+                f.write(b'{')
+                write_json_object(f, [
+                    ('messages', list(game.messages)),
+                    ('game_over', game.game_over),
+                    ('current_level', game.current_level),
+                    ('in_shop', game.in_shop)
+                ])
+                f.write(b',"dungeon":{')
+                write_json_object(f, [
+                    ('width', dungeon.width),
+                    ('height', dungeon.height),
+                    ('level', dungeon.level),
+                    ('grid', [''.join(map(cell_value, row)) for row in dungeon.grid]),
+                    ('stairs_pos', {'x': dungeon.stairs_pos.x, 'y': dungeon.stairs_pos.y} if dungeon.stairs_pos else None)
+                ])
                 
-                # Save shield
-                if entity.shield:
-                    entity_data['shield'] = {
-                        'name': entity.shield.name,
-                        'type': entity.shield.type.value,
-                        'value': entity.shield.value,
-                        'attack_bonus': entity.shield.attack_bonus,
-                        'defense_bonus': entity.shield.defense_bonus,
-                        'heal_amount': entity.shield.heal_amount,
-                        'spell_type': entity.shield.spell_type.value if entity.shield.spell_type else None
-                    }
-                else:
-                    entity_data['shield'] = None
+                # Save entities
+                f.write(b',"entities":')
+                write_json_array(f, (entity_to_dict(entity) for entity in dungeon.entities))
                 
-                # Save equipment (backwards compatibility)
-                if entity.equipment:
-                    entity_data['equipment'] = {
-                        'name': entity.equipment.name,
-                        'type': entity.equipment.type.value,
-                        'value': entity.equipment.value,
-                        'attack_bonus': entity.equipment.attack_bonus,
-                        'defense_bonus': entity.equipment.defense_bonus,
-                        'heal_amount': entity.equipment.heal_amount
-                    }
-                else:
-                    entity_data['equipment'] = None
-                
-                save_data['dungeon']['entities'].append(entity_data)
-            
-            # Save items
-            for item_pos, item in game.dungeon.items:
-                save_data['dungeon']['items'].append({
-                    'pos': {'x': item_pos.x, 'y': item_pos.y},
-                    'item': {
-                        'name': item.name,
-                        'type': item.type.value,
-                        'value': item.value,
-                        'attack_bonus': item.attack_bonus,
-                        'defense_bonus': item.defense_bonus,
-                        'heal_amount': item.heal_amount,
-                        'spell_type': item.spell_type.value if item.spell_type else None
-                    }
-                })
-            
-            with open('savegame.json', 'w') as f:
-                json.dump(save_data, f, indent=2)
+                # Save items
+                f.write(b',"items":')
+                write_json_array(f, ({'pos': {'x': item_pos.x, 'y': item_pos.y}, 'item': item_to_dict(item)}
+                                     for item_pos, item in dungeon.items.items()))
+                f.write(b'}}')
+            os.replace(TEMP_SAVE_PATH, SAVE_PATH)
             
             return True, "Game saved!"
             
         except Exception as e:
+            try:
+                os.remove(TEMP_SAVE_PATH)
+            except OSError:
+                pass
             return False, f"Failed to save game: {str(e)}"
     
     @staticmethod
     def load_game(game):
         """Load game state from JSON file"""
         try:
-            with open('savegame.json', 'r') as f:
-                save_data = json.load(f)
+            with open(SAVE_PATH, 'rb') as f:
+                raw_data = f.read()
+            save_data = parse_save_data(raw_data)
             
             # Restore dungeon
             level = save_data['dungeon'].get('level', 1)
@@ -166,14 +226,12 @@ class SaveLoadSystem:
             if stairs_data:
                 game.dungeon.stairs_pos = Position(stairs_data['x'], stairs_data['y'])
             
-            # Restore grid
-            for y in range(game.dungeon.height):
-                for x in range(game.dungeon.width):
-                    cell_value = save_data['dungeon']['grid'][y][x]
-                    for cell_type in CellType:
-                        if cell_type.value == cell_value:
-                            game.dungeon.grid[y][x] = cell_type
-                            break
+            # Restore grid - rows are saved as strings of cell characters (older
+            # saves use lists of characters, which iterate the same way)
+            cell_types = CELL_TYPES_BY_VALUE
+            game.dungeon.grid = [[cell_types.get(value, CellType.WALL) for value in row]
+                                 for row in save_data['dungeon']['grid']]
+            game.dungeon.build_grid_codes()
             
             # Initialize shop if needed
             if game.in_shop:
@@ -182,11 +240,7 @@ class SaveLoadSystem:
             # Restore entities
             for entity_data in save_data['dungeon']['entities']:
                 # Find entity type
-                entity_type = None
-                for et in EntityType:
-                    if et.value == entity_data['type']:
-                        entity_type = et
-                        break
+                entity_type = ENTITY_TYPES_BY_VALUE.get(entity_data['type'])
                 
                 entity = Entity(
                     pos=Position(entity_data['pos']['x'], entity_data['pos']['y']),
@@ -196,7 +250,7 @@ class SaveLoadSystem:
                     attack=entity_data['attack'],
                     defense=entity_data['defense'],
                     name=entity_data['name'],
-                    inventory=[],
+                    inventory=[item_from_dict(item_data) for item_data in entity_data['inventory']],
                     gold=entity_data['gold'],
                     xp=entity_data.get('xp', 0),
                     level=entity_data.get('level', 1),
@@ -204,130 +258,27 @@ class SaveLoadSystem:
                     mana=entity_data.get('mana', 20),
                     max_mana=entity_data.get('max_mana', 20),
                     angle=entity_data.get('angle', 0.0),
-                    known_spells=[],
+                    # Spells of a type this version doesn't know are dropped
+                    known_spells=[spell_from_dict(spell_data) for spell_data in entity_data.get('known_spells', [])
+                                  if spell_data['spell_type'] in SPELL_TYPES_BY_VALUE],
                     active_effects=entity_data.get('active_effects', [])
                 )
                 
-                # Restore inventory
-                for item_data in entity_data['inventory']:
-                    item_type = None
-                    for it in EntityType:
-                        if it.value == item_data['type']:
-                            item_type = it
-                            break
-                    
-                    spell_type = None
-                    if item_data.get('spell_type'):
-                        for st in SpellType:
-                            if st.value == item_data['spell_type']:
-                                spell_type = st
-                                break
-                    
-                    item = Item(
-                        name=item_data['name'],
-                        type=item_type,
-                        value=item_data['value'],
-                        attack_bonus=item_data['attack_bonus'],
-                        defense_bonus=item_data['defense_bonus'],
-                        heal_amount=item_data['heal_amount'],
-                        spell_type=spell_type
-                    )
-                    entity.inventory.append(item)
-                
-                # Restore known spells
-                for spell_data in entity_data.get('known_spells', []):
-                    spell_type = None
-                    for st in SpellType:
-                        if st.value == spell_data['spell_type']:
-                            spell_type = st
-                            break
-                    
-                    if spell_type:
-                        spell = Spell(
-                            spell_type=spell_type,
-                            name=spell_data['name'],
-                            description=spell_data['description'],
-                            mana_cost=spell_data['mana_cost'],
-                            damage=spell_data.get('damage', 0),
-                            heal_amount=spell_data.get('heal_amount', 0),
-                            range=spell_data.get('range', 1),
-                            area_effect=spell_data.get('area_effect', False),
-                            status_effect=spell_data.get('status_effect'),
-                            duration=spell_data.get('duration', 0)
-                        )
-                        entity.known_spells.append(spell)
-                
                 # Restore weapon
                 if entity_data.get('weapon'):
-                    weapon_data = entity_data['weapon']
-                    weapon_type = None
-                    for it in EntityType:
-                        if it.value == weapon_data['type']:
-                            weapon_type = it
-                            break
-                    
-                    weapon_spell_type = None
-                    if weapon_data.get('spell_type'):
-                        for st in SpellType:
-                            if st.value == weapon_data['spell_type']:
-                                weapon_spell_type = st
-                                break
-                    
-                    entity.weapon = Item(
-                        name=weapon_data['name'],
-                        type=weapon_type,
-                        value=weapon_data['value'],
-                        attack_bonus=weapon_data['attack_bonus'],
-                        defense_bonus=weapon_data['defense_bonus'],
-                        heal_amount=weapon_data['heal_amount'],
-                        spell_type=weapon_spell_type
-                    )
+                    entity.weapon = item_from_dict(entity_data['weapon'])
                 
                 # Restore shield
                 if entity_data.get('shield'):
-                    shield_data = entity_data['shield']
-                    shield_type = None
-                    for it in EntityType:
-                        if it.value == shield_data['type']:
-                            shield_type = it
-                            break
-                    
-                    shield_spell_type = None
-                    if shield_data.get('spell_type'):
-                        for st in SpellType:
-                            if st.value == shield_data['spell_type']:
-                                shield_spell_type = st
-                                break
-                    
-                    entity.shield = Item(
-                        name=shield_data['name'],
-                        type=shield_type,
-                        value=shield_data['value'],
-                        attack_bonus=shield_data['attack_bonus'],
-                        defense_bonus=shield_data['defense_bonus'],
-                        heal_amount=shield_data['heal_amount'],
-                        spell_type=shield_spell_type
-                    )
+                    entity.shield = item_from_dict(entity_data['shield'])
                 
                 # Restore equipment (backwards compatibility)
                 if entity_data.get('equipment') and not entity.weapon:
-                    eq_data = entity_data['equipment']
-                    eq_type = None
-                    for it in EntityType:
-                        if it.value == eq_data['type']:
-                            eq_type = it
-                            break
-                    
-                    entity.weapon = Item(
-                        name=eq_data['name'],
-                        type=eq_type,
-                        value=eq_data['value'],
-                        attack_bonus=eq_data['attack_bonus'],
-                        defense_bonus=eq_data['defense_bonus'],
-                        heal_amount=eq_data['heal_amount']
-                    )
+                    entity.weapon = item_from_dict(entity_data['equipment'])
                 
                 game.dungeon.entities.append(entity)
+                if entity_type in MONSTER_TYPES:
+                    game.dungeon.monsters.append(entity)
                 
                 # Set player reference
                 if entity.type == EntityType.PLAYER:
@@ -335,34 +286,12 @@ class SaveLoadSystem:
             
             # Restore items
             for item_data in save_data['dungeon']['items']:
-                item_type = None
-                for it in EntityType:
-                    if it.value == item_data['item']['type']:
-                        item_type = it
-                        break
-                
-                item_spell_type = None
-                if item_data['item'].get('spell_type'):
-                    for st in SpellType:
-                        if st.value == item_data['item']['spell_type']:
-                            item_spell_type = st
-                            break
-                
-                item = Item(
-                    name=item_data['item']['name'],
-                    type=item_type,
-                    value=item_data['item']['value'],
-                    attack_bonus=item_data['item']['attack_bonus'],
-                    defense_bonus=item_data['item']['defense_bonus'],
-                    heal_amount=item_data['item']['heal_amount'],
-                    spell_type=item_spell_type
-                )
-                
-                pos = Position(item_data['pos']['x'], item_data['pos']['y'])
-                game.dungeon.items.append((pos, item))
+                item_pos = Position(item_data['pos']['x'], item_data['pos']['y'])
+                game.dungeon.items.setdefault(item_pos, item_from_dict(item_data['item']))
             
             # Restore game state
-            game.messages = save_data['messages']
+            game.messages.clear()
+            game.messages.extend(save_data['messages'])
             game.game_over = save_data['game_over']
             
             return True, "Game loaded!"
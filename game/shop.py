@@ -3,9 +3,56 @@ Shop system and item generation
 """
 
 import random
+from bisect import bisect_left, bisect_right
+from dataclasses import replace
+from functools import lru_cache
 from .entities import Item, EntityType
 
 
+# Weapon and shield tiers as (name, base power), sorted by power so a level's
+# band of tiers is one contiguous slice
+WEAPON_TYPES = (
+    ("Dagger", 2), ("Short Sword", 3), ("Sword", 4), 
+    ("Battle Axe", 5), ("War Hammer", 6), ("Great Sword", 7),
+    ("Enchanted Blade", 8), ("Legendary Weapon", 10)
+)
+WEAPON_POWERS = [power for _, power in WEAPON_TYPES]
+
+SHIELD_TYPES = (
+    ("Buckler", 1), ("Iron Shield", 2), ("Steel Shield", 3), 
+    ("Tower Shield", 4), ("Enchanted Shield", 5), ("Legendary Shield", 6)
+)
+SHIELD_DEFENSES = [defense for _, defense in SHIELD_TYPES]
+
+# Potion tiers - fixed heal amount, price is rolled per shop
+HEALTH_POTION = Item("Health Potion", EntityType.POTION, heal_amount=20)
+GREATER_HEALTH_POTION = Item("Greater Health Potion", EntityType.POTION, heal_amount=40)
+
+
+@lru_cache(maxsize=16)
+def shop_templates(level):
+    """Item templates for the weapon and shield tiers stocked at a level
+    
+    Returns (weapons, shields), each a tuple of (template Item, base power).
+    Shops copy the templates with dataclasses.replace, filling in rolled stats.
+    """
+    # Choose weapons appropriate for current level
+    min_power = max(2, level - 2)
+    max_power = min(len(WEAPON_TYPES), level + 3)
+    weapons = tuple((Item(name, EntityType.WEAPON), power) for name, power in
+                    WEAPON_TYPES[bisect_left(WEAPON_POWERS, min_power):
+                                 bisect_right(WEAPON_POWERS, max_power)])
+    
+    # Choose shields appropriate for current level
+    min_defense = max(1, level - 3)
+    max_defense = min(len(SHIELD_TYPES), level)
+    shields = tuple((Item(name, EntityType.SHIELD), defense) for name, defense in
+                    SHIELD_TYPES[bisect_left(SHIELD_DEFENSES, min_defense):
+                                 bisect_right(SHIELD_DEFENSES, max_defense)])
+    
+    return weapons, shields
+
+
 class Shop:
     def __init__(self, level: int = 1):
         self.level = level
@@ -13,6 +60,7 @@ class Shop:
     
     def generate_shop_inventory(self):
         items = []
+        available_weapons, available_shields = shop_templates(self.level)
         
         # Generate 2-3 potions of varying quality
         potion_count = random.randint(2, 3)
@@ -20,42 +68,32 @@ class Shop:
             # Choose between two fixed potion tiers
             if self.level >= 3 and random.random() < 0.4:
                 # Greater potion - fixed heal amount, variable price
-                base_heal = 40  # Fixed healing
+                potion = GREATER_HEALTH_POTION
                 base_value = random.randint(25, 35)  # Variable price
-                name = "Greater Health Potion"
             else:
                 # Regular potion - fixed heal amount, variable price
-                base_heal = 20  # Fixed healing
+                potion = HEALTH_POTION
                 base_value = random.randint(12, 18)  # Variable price
-                name = "Health Potion"
             
-            items.append(Item(name, EntityType.POTION, value=base_value, heal_amount=base_heal))
+            items.append(replace(potion, value=base_value))
         
         # Generate 2-4 weapons with level-appropriate power
         weapon_count = random.randint(2, 4)
-        weapon_types = [
-            ("Dagger", 2), ("Short Sword", 3), ("Sword", 4), 
-            ("Battle Axe", 5), ("War Hammer", 6), ("Great Sword", 7),
-            ("Enchanted Blade", 8), ("Legendary Weapon", 10)
-        ]
         
-        for _ in range(weapon_count):
-            # Choose weapons appropriate for current level
-            min_power = max(2, self.level - 2)
-            max_power = min(len(weapon_types), self.level + 3)
+        if available_weapons:
+            # Roll every weapon's type, bonus and price factor in one batch each
+            weapon_picks = random.choices(available_weapons, k=weapon_count)
+            bonus_rolls = random.choices(range(-1, 3), k=weapon_count)
+            price_rolls = random.choices(range(6, 11), k=weapon_count)
             
-            # Filter weapons by power level
-            available_weapons = [(name, power) for name, power in weapon_types 
-                               if min_power <= power <= max_power]
-            
-            if available_weapons:
-                weapon_name, base_attack = random.choice(available_weapons)
+            for (template, base_attack), bonus_roll, price_roll in zip(weapon_picks, bonus_rolls, price_rolls):
                 # Add some randomization and level scaling
-                attack_bonus = base_attack + random.randint(-1, 2) + (self.level - 1)
+                attack_bonus = base_attack + bonus_roll + (self.level - 1)
                 attack_bonus = max(2, attack_bonus)  # Minimum 2 attack
                 
                 # Price scales moderately with attack power
-                value = attack_bonus * random.randint(6, 10) + (self.level - 1) * 5
+                value = attack_bonus * price_roll + (self.level - 1) * 5
+                weapon_name = template.name
                 
                 # Add level prefix for higher level items
                 if self.level >= 4 and attack_bonus >= 7:
@@ -69,33 +107,26 @@ class Shop:
                         attack_bonus += 2
                         value = int(value * 1.4)  # Reduced from 1.6
                 
-                items.append(Item(weapon_name, EntityType.WEAPON, value=value, attack_bonus=attack_bonus))
+                items.append(replace(template, name=weapon_name, value=value, attack_bonus=attack_bonus))
         
         # Generate 1-2 shields at higher levels
         if self.level >= 2:
             shield_count = random.randint(1, 2) if self.level >= 4 else random.randint(0, 1)
-            shield_types = [
-                ("Buckler", 1), ("Iron Shield", 2), ("Steel Shield", 3), 
-                ("Tower Shield", 4), ("Enchanted Shield", 5), ("Legendary Shield", 6)
-            ]
             
-            for _ in range(shield_count):
-                # Choose shields appropriate for current level
-                min_defense = max(1, self.level - 3)
-                max_defense = min(len(shield_types), self.level)
-                
-                # Filter shields by defense level
-                available_shields = [(name, defense) for name, defense in shield_types 
-                                   if min_defense <= defense <= max_defense]
+            if available_shields and shield_count:
+                # Roll every shield's type, bonus and price factor in one batch each
+                shield_picks = random.choices(available_shields, k=shield_count)
+                bonus_rolls = random.choices(range(0, 2), k=shield_count)
+                price_rolls = random.choices(range(8, 13), k=shield_count)
                 
-                if available_shields:
-                    shield_name, base_defense = random.choice(available_shields)
+                for (template, base_defense), bonus_roll, price_roll in zip(shield_picks, bonus_rolls, price_rolls):
                     # Add some randomization and level scaling
-                    defense_bonus = base_defense + random.randint(0, 1) + max(0, (self.level - 2) // 2)
+                    defense_bonus = base_defense + bonus_roll + max(0, (self.level - 2) // 2)
                     defense_bonus = max(1, defense_bonus)  # Minimum 1 defense
                     
                     # Price scales with defense power
-                    value = defense_bonus * random.randint(8, 12) + (self.level - 1) * 3
+                    value = defense_bonus * price_roll + (self.level - 1) * 3
+                    shield_name = template.name
                     
                     # Add level prefix for higher level items
                     if self.level >= 5 and defense_bonus >= 4:
@@ -109,6 +140,6 @@ class Shop:
                             defense_bonus += 2
                             value = int(value * 1.5)
                     
-                    items.append(Item(shield_name, EntityType.SHIELD, value=value, defense_bonus=defense_bonus))
+                    items.append(replace(template, name=shield_name, value=value, defense_bonus=defense_bonus))
         
         return items
\ No newline at end of file
@@ -4,26 +4,88 @@ AIRogue - A CLI-based roguelike game
 """
 
 import curses
+import itertools
 import random
 import sys
 import os
 import math
+from collections import deque
 
 from game.entities import Entity, EntityType, Item, Position
-from game.dungeon import Dungeon, CellType
+from game.dungeon import Dungeon, CellType, CELL_CODES
 from game.shop import Shop
 from game.combat import CombatSystem
 from game.levelup import LevelingSystem, LevelUpReward
 from game.save_load import SaveLoadSystem
 from game.intro import IntroScreen
-from game.renderer3d import Renderer3D
+from game.renderer3d import Renderer3D, normalize_angle
 from game.magic import MagicSystem
 
 
+# 2D movement keys (wasd, vi-keys, arrows) -> (dx, dy)
+MOVE_KEYS = {
+    ord('w'): (0, -1), ord('k'): (0, -1), curses.KEY_UP: (0, -1),
+    ord('s'): (0, 1), ord('j'): (0, 1), curses.KEY_DOWN: (0, 1),
+    ord('a'): (-1, 0), ord('h'): (-1, 0), curses.KEY_LEFT: (-1, 0),
+    ord('d'): (1, 0), ord('l'): (1, 0), curses.KEY_RIGHT: (1, 0),
+}
+
+# Color pair numbers (see setup_colors) for each entity and cell type
+ENTITY_COLOR_PAIRS = {
+    EntityType.PLAYER: 2,
+    EntityType.GOBLIN: 3,
+    EntityType.ORC: 3,
+    EntityType.POTION: 4,
+    EntityType.WEAPON: 5,
+    EntityType.SHIELD: 5,      # Same color as weapons for now
+    EntityType.GOLD: 6,
+    EntityType.SHOPKEEPER: 10,
+    EntityType.SPELLBOOK: 11,  # Purple for spellbooks
+}
+CELL_COLOR_PAIRS = {
+    CellType.FLOOR: 7,
+    CellType.WALL: 1,
+    CellType.STAIRS_DOWN: 9,
+}
+
+# Directions a wandering monster picks from
+WANDER_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+
+# Grid step for each 90-degree facing, starting at angle 0 (east) and turning
+# clockwise on screen
+FACING_STEPS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+# 3D movement keys -> quarter turns from the player's facing
+MOVE_3D_KEYS = {
+    ord('w'): 0,    # Forward
+    ord('s'): 2,    # Backward
+    ord('a'): -1,   # Strafe left
+    ord('d'): 1,    # Strafe right
+}
+
+# Controls hint shown under the 2D view
+CONTROLS_2D = "Move: wasd/hjkl/arrows, Inventory: i, F: cast spell, 3: toggle 2D/3D, Save: S, Quit: q"
+CONTROLS_3D = "3D: Arrows turn, WASD move, I: inventory, F: cast spell, 3: toggle 2D/3D, S: save, Q: quit"
+
+# Menu selection keys 1-9 -> list index
+NUMBER_KEYS = {ord(char): index for index, char in enumerate('123456789')}
+
+# Shop sell keys (Shift+1-9 on a US layout) -> inventory index
+SELL_KEYS = {ord(char): index for index, char in enumerate('!@#$%^&*(')}
+
+
+def facing_step(angle, quarter_turns=0):
+    """(dx, dy) of one tile in the direction an angle faces, turned by quarter_turns
+    
+    3D turning snaps to 90 degrees, so the facing is one of FACING_STEPS.
+    """
+    return FACING_STEPS[(int(round(angle / (math.pi / 2))) + quarter_turns) & 3]
+
+
 class Game:
     def __init__(self, stdscr, load_game=False):
         self.stdscr = stdscr
-        self.messages = []
+        self.messages = deque(maxlen=5)  # Oldest message drops off when full
         self.game_over = False
         self.show_inventory = False
         self.in_shop = False
@@ -33,6 +95,25 @@ class Game:
         self.show_levelup_screen = False
         self.levelup_rewards = []
         
+        # Set when input arrives - the screen is only redrawn when something changed
+        self.dirty = True
+        
+        # 2D UI text lines and the values they were built from
+        self._ui_key = None
+        self._ui_lines = []
+        
+        # Level-up screen lines and the rewards/terminal size they were built for
+        self._levelup_key = None
+        self._levelup_lines = []
+        
+        # Death screen lines and the stats/terminal size they were built for
+        self._death_key = None
+        self._death_lines = []
+        
+        # Pre-rendered dungeon layout, rebuilt when the grid changes
+        self._grid_pad = None
+        self._grid_pad_codes = None
+        
         # 3D rendering
         self.render_3d = False
         self.renderer_3d = Renderer3D(stdscr)
@@ -42,6 +123,11 @@ class Game:
         self.spell_targeting = False
         self.targeting_spell = None
         
+        # Walking distances to the player, see move_monster
+        self._chase_distances = None
+        self._chase_grid = None
+        self._chase_origin = None
+        
         if load_game and os.path.exists('savegame.json'):
             success, message = SaveLoadSystem.load_game(self)
             if success:
@@ -54,8 +140,9 @@ class Game:
         
         # Setup curses
         curses.curs_set(0)  # Hide cursor
-        self.stdscr.nodelay(True)  # Non-blocking input
-        self.stdscr.timeout(100)  # 100ms timeout
+        # Block until a key arrives - the game is turn based, so nothing changes
+        # (or needs redrawing) between keypresses
+        self.stdscr.timeout(-1)
         
         # Initialize colors
         self.setup_colors()
@@ -81,44 +168,43 @@ class Game:
             curses.init_pair(9, curses.COLOR_WHITE, -1)    # Stairs
             curses.init_pair(10, curses.COLOR_MAGENTA, -1) # Shopkeeper
             curses.init_pair(11, curses.COLOR_MAGENTA, -1) # Spellbooks
+        
+        # Attribute for each color pair number, 0 on terminals without color
+        has_colors = curses.has_colors()
+        self.color_pairs = [curses.color_pair(pair) if has_colors else 0 for pair in range(12)]
+        
+        # Character and color for every entity and cell type, looked up per frame
+        self.entity_glyphs = {entity_type: (entity_type.value, self.get_color_pair(entity_type=entity_type))
+                              for entity_type in EntityType}
+        self.cell_glyphs = {cell_type: (cell_type.value, self.get_color_pair(cell_type=cell_type))
+                            for cell_type in CellType}
+        self.ui_color = self.get_color_pair()
     
     def get_color_pair(self, entity_type=None, cell_type=None):
-        if not curses.has_colors():
-            return 0
-        
-        if entity_type:
-            if entity_type == EntityType.PLAYER:
-                return curses.color_pair(2)
-            elif entity_type in [EntityType.GOBLIN, EntityType.ORC]:
-                return curses.color_pair(3)
-            elif entity_type == EntityType.POTION:
-                return curses.color_pair(4)
-            elif entity_type == EntityType.WEAPON:
-                return curses.color_pair(5)
-            elif entity_type == EntityType.SHIELD:
-                return curses.color_pair(5)  # Same color as weapons for now
-            elif entity_type == EntityType.GOLD:
-                return curses.color_pair(6)
-            elif entity_type == EntityType.SPELLBOOK:
-                return curses.color_pair(11)  # Purple for spellbooks
-        
-        if cell_type:
-            if cell_type == CellType.FLOOR:
-                return curses.color_pair(7)
-            elif cell_type == CellType.WALL:
-                return curses.color_pair(1)
-            elif cell_type == CellType.STAIRS_DOWN:
-                return curses.color_pair(9)
-        
-        if entity_type == EntityType.SHOPKEEPER:
-            return curses.color_pair(10)
-        
-        return curses.color_pair(1)  # Default
+        pair = ENTITY_COLOR_PAIRS.get(entity_type) or CELL_COLOR_PAIRS.get(cell_type) or 1  # Default
+        return self.color_pairs[pair]
     
     def add_message(self, msg: str):
         self.messages.append(msg)
-        if len(self.messages) > 5:
-            self.messages.pop(0)
+    
+    def build_grid_pad(self):
+        """Render the static dungeon layout into an off-screen pad"""
+        # One spare column so writing the last cell doesn't hit the pad's edge
+        pad = curses.newpad(self.dungeon.height, self.dungeon.width + 1)
+        width = self.dungeon.width
+        grid_codes = self.dungeon.grid_codes
+        code_glyphs = [self.cell_glyphs[cell_type] for cell_type in CELL_CODES]
+        for y in range(self.dungeon.height):
+            # One addstr per run of identical cells (wall and floor spans),
+            # found by scanning the row's cell codes rather than enum members
+            x = 0
+            for code, run in itertools.groupby(grid_codes[y * width:(y + 1) * width]):
+                run_length = len(list(run))
+                char, color = code_glyphs[code]
+                pad.addstr(y, x, char * run_length, color)
+                x += run_length
+        self._grid_pad = pad
+        self._grid_pad_codes = self.dungeon.grid_codes
     
     def draw(self):
         if self.render_3d and self.dungeon.player and not self.show_inventory and not self.in_shop and not self.show_death_screen and not self.show_levelup_screen:
@@ -127,114 +213,149 @@ class Game:
             self.renderer_3d.render_scene(self, float(player.pos.x) + 0.5, float(player.pos.y) + 0.5, player.angle)
             return
         
-        # Original 2D rendering for menus and inventory
-        self.stdscr.clear()
+        # Full-screen menus clear the screen and draw over everything, so the
+        # map underneath them is never seen - skip drawing it
+        if self.show_death_screen or self.show_levelup_screen or self.in_shop or self.show_inventory:
+            if self.show_death_screen:
+                self.draw_death_screen()
+            elif self.show_levelup_screen:
+                self.draw_levelup_screen()
+            elif self.in_shop:
+                self.draw_shop()
+            elif self.show_inventory:
+                self.draw_inventory()
+            self.stdscr.noutrefresh()
+            curses.doupdate()
+            return
+        
+        # 2D map rendering
+        self.stdscr.erase()
         
-        # Draw dungeon
-        for y in range(self.dungeon.height):
-            for x in range(self.dungeon.width):
+        # Draw dungeon - the layout only changes with a new floor (or a load),
+        # which always replaces grid_codes, so it is rendered once and copied
+        if self._grid_pad is None or self._grid_pad_codes is not self.dungeon.grid_codes:
+            self.build_grid_pad()
+        screen_height, screen_width = self.stdscr.getmaxyx()
+        view_height = min(self.dungeon.height, screen_height)
+        view_width = min(self.dungeon.width, screen_width)
+        try:
+            self._grid_pad.overwrite(self.stdscr, 0, 0, 0, 0, view_height - 1, view_width - 1)
+        except curses.error:
+            pass
+        
+        # Draw items and entities - only those inside the visible part of the map
+        entity_glyphs = self.entity_glyphs
+        for item_pos, item in self.dungeon.items.items():
+            if item_pos.y < view_height and item_pos.x < view_width:
                 try:
-                    char = self.dungeon.grid[y][x].value
-                    color = self.get_color_pair(cell_type=self.dungeon.grid[y][x])
-                    self.stdscr.addch(y, x, char, color)
+                    self.stdscr.addch(item_pos.y, item_pos.x, *entity_glyphs[item.type])
                 except curses.error:
                     pass
         
-        # Draw items
-        for item_pos, item in self.dungeon.items:
-            try:
-                color = self.get_color_pair(entity_type=item.type)
-                self.stdscr.addch(item_pos.y, item_pos.x, item.type.value, color)
-            except curses.error:
-                pass
-        
-        # Draw entities
         for entity in self.dungeon.entities:
-            if entity.hp > 0:
+            pos = entity.pos
+            if entity.hp > 0 and pos.y < view_height and pos.x < view_width:
                 try:
-                    color = self.get_color_pair(entity_type=entity.type)
-                    self.stdscr.addch(entity.pos.y, entity.pos.x, entity.type.value, color)
+                    self.stdscr.addch(pos.y, pos.x, *entity_glyphs[entity.type])
                 except curses.error:
                     pass
         
-        if self.show_death_screen:
-            self.draw_death_screen()
-        elif self.show_levelup_screen:
-            self.draw_levelup_screen()
-        elif self.in_shop:
-            self.draw_shop()
-        elif self.show_inventory:
-            self.draw_inventory()
-        else:
-            # Draw UI
-            ui_y = self.dungeon.height + 1
-            try:
-                player = self.dungeon.player
-                ui_color = self.get_color_pair() if curses.has_colors() else 0
-                
-                if player:
-                    # HP display with color coding
-                    hp_color = curses.color_pair(3) if player.hp < player.max_hp * 0.3 else ui_color
-                    self.stdscr.addstr(ui_y, 0, f"HP: {player.hp}/{player.max_hp}", hp_color)
-                    
-                    # Mana display with color coding
-                    mana_color = curses.color_pair(11) if curses.has_colors() else ui_color
-                    self.stdscr.addstr(ui_y + 1, 0, f"MP: {player.mana}/{player.max_mana}", mana_color)
-                    
-                    attack_total = player.attack + (player.weapon.attack_bonus if player.weapon else 0)
-                    defense_total = player.defense + (player.weapon.defense_bonus if player.weapon else 0) + (player.shield.defense_bonus if player.shield else 0)
-                    self.stdscr.addstr(ui_y + 1, 20, f"Attack: {attack_total}", ui_color)
-                    self.stdscr.addstr(ui_y + 1, 35, f"Defense: {defense_total}", ui_color)
-                    
-                    # Gold with color
-                    gold_color = curses.color_pair(6) if curses.has_colors() else 0
-                    self.stdscr.addstr(ui_y, 50, f"Gold: {player.gold}", gold_color)
-                    
-                    # Character level and XP
-                    xp_for_next = LevelingSystem.xp_for_next_level(player.level)
-                    xp_progress = LevelingSystem.get_xp_progress(player.xp, player.level)
-                    self.stdscr.addstr(ui_y, 65, f"Char Lv: {player.level}", ui_color)
-                    self.stdscr.addstr(ui_y + 1, 65, f"XP: {xp_progress}/{xp_for_next}", ui_color)
-                    
-                    # Dungeon level
-                    self.stdscr.addstr(ui_y + 1, 50, f"Floor: {self.current_level}", ui_color)
-                    
-                    # Equipment display
-                    equipment_line = 0
-                    if player.weapon:
-                        weapon_color = curses.color_pair(5) if curses.has_colors() else 0
-                        self.stdscr.addstr(ui_y + 1 + equipment_line, 0, f"Weapon: {player.weapon.name}", weapon_color)
-                        equipment_line += 1
-                    
-                    if player.shield:
-                        shield_color = curses.color_pair(5) if curses.has_colors() else 0
-                        self.stdscr.addstr(ui_y + 1 + equipment_line, 0, f"Shield: {player.shield.name}", shield_color)
-                        equipment_line += 1
-                
-                # Draw messages
-                equipment_lines = 0
-                if player and player.weapon:
-                    equipment_lines += 1
-                if player and player.shield:
-                    equipment_lines += 1
-                
-                msg_start = ui_y + 2 + equipment_lines
-                for i, msg in enumerate(self.messages):
-                    self.stdscr.addstr(msg_start + i, 0, msg, ui_color)
-                
-                # Instructions
-                if self.render_3d:
-                    self.stdscr.addstr(ui_y + 8, 0, "3D: Arrows turn, WASD move, I: inventory, F: cast spell, 3: toggle 2D/3D, S: save, Q: quit", ui_color)
-                else:
-                    self.stdscr.addstr(ui_y + 8, 0, "Move: wasd/hjkl/arrows, Inventory: i, F: cast spell, 3: toggle 2D/3D, Save: S, Quit: q", ui_color)
-                
-            except curses.error:
-                pass
+        # Draw UI - the text only changes once per turn at most, so it is rebuilt
+        # only when one of the values shown changes
+        player = self.dungeon.player
+        ui_key = (player and (player.hp, player.max_hp, player.mana, player.max_mana,
+                              player.attack, player.defense, player.weapon, player.shield,
+                              player.gold, player.level, player.xp),
+                  self.dungeon.height, self.current_level, tuple(self.messages), self.render_3d)
+        if ui_key != self._ui_key:
+            self._ui_key = ui_key
+            self._ui_lines = self.layout_ui(player)
         
-        self.stdscr.refresh()
+        try:
+            for y, x, text, attr in self._ui_lines:
+                self.stdscr.addstr(y, x, text, attr)
+        except curses.error:
+            pass
+    
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+    
+    def layout_ui(self, player):
+        """Build the 2D status panel, messages and controls as (y, x, text, attr) lines
+        
+        Lines are drawn in order, so later ones overwrite earlier ones they overlap.
+        """
+        ui_y = self.dungeon.height + 1
+        ui_color = self.ui_color
+        lines = []
+        
+        if player:
+            # HP display with color coding
+            hp_color = self.color_pairs[3] if player.hp < player.max_hp * 0.3 else ui_color
+            lines.append((ui_y, 0, f"HP: {player.hp}/{player.max_hp}", hp_color))
+            
+            # Mana display with color coding
+            mana_color = self.color_pairs[11]
+            lines.append((ui_y + 1, 0, f"MP: {player.mana}/{player.max_mana}", mana_color))
+            
+            attack_total = player.attack + (player.weapon.attack_bonus if player.weapon else 0)
+            defense_total = player.defense + (player.weapon.defense_bonus if player.weapon else 0) + (player.shield.defense_bonus if player.shield else 0)
+            lines.append((ui_y + 1, 20, f"Attack: {attack_total}", ui_color))
+            lines.append((ui_y + 1, 35, f"Defense: {defense_total}", ui_color))
+            
+            # Gold with color
+            gold_color = self.color_pairs[6]
+            lines.append((ui_y, 50, f"Gold: {player.gold}", gold_color))
+            
+            # Character level and XP
+            xp_for_next = LevelingSystem.xp_for_next_level(player.level)
+            xp_progress = LevelingSystem.get_xp_progress(player.xp, player.level)
+            lines.append((ui_y, 65, f"Char Lv: {player.level}", ui_color))
+            lines.append((ui_y + 1, 65, f"XP: {xp_progress}/{xp_for_next}", ui_color))
+            
+            # Dungeon level
+            lines.append((ui_y + 1, 50, f"Floor: {self.current_level}", ui_color))
+            
+            # Equipment display
+            equipment_line = 0
+            if player.weapon:
+                weapon_color = self.color_pairs[5]
+                lines.append((ui_y + 1 + equipment_line, 0, f"Weapon: {player.weapon.name}", weapon_color))
+                equipment_line += 1
+            
+            if player.shield:
+                shield_color = self.color_pairs[5]
+                lines.append((ui_y + 1 + equipment_line, 0, f"Shield: {player.shield.name}", shield_color))
+                equipment_line += 1
+        
+        # Draw messages
+        equipment_lines = 0
+        if player and player.weapon:
+            equipment_lines += 1
+        if player and player.shield:
+            equipment_lines += 1
+        
+        msg_start = ui_y + 2 + equipment_lines
+        for i, msg in enumerate(self.messages):
+            lines.append((msg_start + i, 0, msg, ui_color))
+        
+        # Instructions
+        lines.append((ui_y + 8, 0, CONTROLS_3D if self.render_3d else CONTROLS_2D, ui_color))
+        
+        return lines
     
     def handle_input(self):
         key = self.stdscr.getch()
+        if key == -1:
+            # No key (e.g. an interrupted read) - nothing to do or redraw
+            return True
+        self.dirty = True
+        
+        if key == curses.KEY_RESIZE:
+            # The 3D renderer sizes its lookup tables and frame buffer to the
+            # terminal, so rebuild it for the new size
+            self.renderer_3d = Renderer3D(self.stdscr)
+            return True
         
         # Handle death screen input first
         if self.show_death_screen:
@@ -286,31 +407,15 @@ class Game:
             
             # Arrow keys for rotation (90-degree increments, no game state progression)
             if key == curses.KEY_LEFT:
-                player.angle -= math.pi / 2  # Rotate left 90 degrees
+                player.angle = normalize_angle(player.angle - math.pi / 2)  # Rotate left 90 degrees
                 # Don't update monsters - just turning
             elif key == curses.KEY_RIGHT:
-                player.angle += math.pi / 2  # Rotate right 90 degrees
+                player.angle = normalize_angle(player.angle + math.pi / 2)  # Rotate right 90 degrees
                 # Don't update monsters - just turning
             
             # WASD for movement (progresses game state) - exactly one tile
-            elif key == ord('w'):  # Move forward
-                dx = int(round(math.cos(player.angle)))
-                dy = int(round(math.sin(player.angle)))
-                self.move_player(dx, dy)
-                player_moved = True
-            elif key == ord('s'):  # Move backward
-                dx = int(round(-math.cos(player.angle)))
-                dy = int(round(-math.sin(player.angle)))
-                self.move_player(dx, dy)
-                player_moved = True
-            elif key == ord('a'):  # Strafe left
-                dx = int(round(math.cos(player.angle - math.pi/2)))
-                dy = int(round(math.sin(player.angle - math.pi/2)))
-                self.move_player(dx, dy)
-                player_moved = True
-            elif key == ord('d'):  # Strafe right
-                dx = int(round(math.cos(player.angle + math.pi/2)))
-                dy = int(round(math.sin(player.angle + math.pi/2)))
+            elif key in MOVE_3D_KEYS:
+                dx, dy = facing_step(player.angle, MOVE_3D_KEYS[key])
                 self.move_player(dx, dy)
                 player_moved = True
             
@@ -319,15 +424,7 @@ class Game:
                 self.update_monsters()
         else:
             # Original 2D movement
-            dx, dy = 0, 0
-            if key in [ord('w'), ord('k'), curses.KEY_UP]:
-                dy = -1
-            elif key in [ord('s'), ord('j'), curses.KEY_DOWN]:
-                dy = 1
-            elif key in [ord('a'), ord('h'), curses.KEY_LEFT]:
-                dx = -1
-            elif key in [ord('d'), ord('l'), curses.KEY_RIGHT]:
-                dx = 1
+            dx, dy = MOVE_KEYS.get(key, (0, 0))
             
             if dx != 0 or dy != 0:
                 self.move_player(dx, dy)
@@ -355,7 +452,7 @@ class Game:
         
         # Check for monsters
         target = self.dungeon.get_entity_at(new_pos)
-        if target and target != player and target.hp > 0:
+        if target and target is not player and target.hp > 0:
             self.combat(player, target)
             return
         
@@ -380,7 +477,7 @@ class Game:
         
         # Check for monsters
         target = self.dungeon.get_entity_at(new_pos)
-        if target and target != player and target.hp > 0:
+        if target and target is not player and target.hp > 0:
             self.combat(player, target)
             return
         
@@ -408,7 +505,7 @@ class Game:
         
         if is_dead:
             self.add_message(f"{defender.name} dies!")
-            if defender == self.dungeon.player:
+            if defender is self.dungeon.player:
                 self.show_death_screen = True
                 self.game_over = True
             else:
@@ -441,56 +538,103 @@ class Game:
             for msg in effect_messages:
                 self.add_message(msg)
         
-        for entity in self.dungeon.entities:
-            if entity.type in [EntityType.GOBLIN, EntityType.ORC] and entity.hp > 0:
+        magic_system = self.magic_system
+        move_monster = self.move_monster
+        # The player stands still while monsters move - read their position once
+        if player:
+            player_x = player.pos.x
+            player_y = player.pos.y
+        # Monsters can die from combat, spells or poison - drop any that have
+        # died since last turn (nothing in the loop below kills another monster)
+        self.dungeon.monsters = [entity for entity in self.dungeon.monsters if entity.hp > 0]
+        for entity in self.dungeon.monsters:
+            # Most monsters carry no effects - only tick and check those that do
+            if entity.active_effects:
                 # Update magical effects on monsters too
-                effect_messages = self.magic_system.update_effects(entity)
+                effect_messages = magic_system.update_effects(entity)
                 for msg in effect_messages:
                     self.add_message(msg)
                 
                 # Check if monster is frozen
-                if not self.magic_system.is_frozen(entity):
-                    self.move_monster(entity)
+                if magic_system.is_frozen(entity):
+                    continue
+            
+            # An earlier monster may have just killed the player
+            if player and player.hp > 0:
+                move_monster(entity, player_x, player_y)
     
-    def move_monster(self, monster: Entity):
-        player = self.dungeon.player
-        if not player or player.hp <= 0:
-            return
+    def move_monster(self, monster: Entity, player_x: int, player_y: int):
+        # Work in raw coordinates - a Position is only built for an actual move
+        dungeon = self.dungeon
+        player = dungeon.player
+        monster_x = monster.pos.x
+        monster_y = monster.pos.y
         
         # Calculate distance to player
-        dx = player.pos.x - monster.pos.x
-        dy = player.pos.y - monster.pos.y
+        dx = player_x - monster_x
+        dy = player_y - monster_y
         distance = abs(dx) + abs(dy)
         
         if distance <= 5:  # Monster can see player - aggressive behavior
             # Move one step towards player
-            move_x = 1 if dx > 0 else -1 if dx < 0 else 0
-            move_y = 1 if dy > 0 else -1 if dy < 0 else 0
-            
-            new_pos = Position(monster.pos.x + move_x, monster.pos.y + move_y)
+            move_x = (dx > 0) - (dx < 0)
+            move_y = (dy > 0) - (dy < 0)
+            new_x = monster_x + move_x
+            new_y = monster_y + move_y
             
             # Check if attacking player
-            if new_pos.x == player.pos.x and new_pos.y == player.pos.y:
+            if new_x == player_x and new_y == player_y:
                 self.combat(monster, player)
                 return
             
-            # Check if can move towards player
-            if (self.dungeon.is_walkable(new_pos) and 
-                not self.dungeon.get_entity_at(new_pos)):
-                monster.pos = new_pos
+            # The distance map only depends on the layout and where the player
+            # stands, so it is kept across turns until either changes (layouts
+            # are rebuilt into a new grid_codes, never edited in place)
+            if (self._chase_grid is not dungeon.grid_codes or 
+                self._chase_origin != (player_x, player_y)):
+                self._chase_distances = dungeon.distance_map(player.pos)
+                self._chase_grid = dungeon.grid_codes
+                self._chase_origin = (player_x, player_y)
+            distances = self._chase_distances
+            width = dungeon.width
+            height = dungeon.height
+            best_distance = distances[monster_y * width + monster_x]
+            if best_distance is None:
+                # Cut off from the player - just head straight for them
+                if (dungeon.is_walkable_xy(new_x, new_y) and 
+                    not dungeon.get_entity_at_xy(new_x, new_y)):
+                    monster.pos = Position(new_x, new_y)
+                return
+            
+            # Follow the walking distance down towards the player, so monsters
+            # path around walls instead of pushing straight into them. The
+            # direct step is tried first so it wins ties
+            best_step = None
+            for step_x, step_y in ((move_x, move_y),) + WANDER_DIRECTIONS:
+                step_x += monster_x
+                step_y += monster_y
+                if not (0 <= step_x < width and 0 <= step_y < height):
+                    continue
+                step_distance = distances[step_y * width + step_x]
+                if (step_distance is not None and step_distance < best_distance and 
+                    not dungeon.get_entity_at_xy(step_x, step_y)):
+                    best_distance = step_distance
+                    best_step = (step_x, step_y)
+            
+            if best_step:
+                monster.pos = Position(*best_step)
         else:  # Player not detected - wander randomly
             # 30% chance to move each turn when wandering
             if random.random() < 0.3:
                 # Choose a random direction
-                directions = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
-                move_x, move_y = random.choice(directions)
-                
-                new_pos = Position(monster.pos.x + move_x, monster.pos.y + move_y)
+                move_x, move_y = random.choice(WANDER_DIRECTIONS)
+                new_x = monster_x + move_x
+                new_y = monster_y + move_y
                 
                 # Check if can wander to this position
-                if (self.dungeon.is_walkable(new_pos) and 
-                    not self.dungeon.get_entity_at(new_pos)):
-                    monster.pos = new_pos
+                if (dungeon.is_walkable_xy(new_x, new_y) and 
+                    not dungeon.get_entity_at_xy(new_x, new_y)):
+                    monster.pos = Position(new_x, new_y)
     
     def pickup_item(self, item: Item, pos: Position):
         player = self.dungeon.player
@@ -516,14 +660,14 @@ class Game:
         self.dungeon.remove_item_at(pos)
     
     def draw_inventory(self):
-        self.stdscr.clear()
+        self.stdscr.erase()
         try:
             # Use colors for inventory
-            title_color = curses.color_pair(8) if curses.has_colors() else 0
-            gold_color = curses.color_pair(6) if curses.has_colors() else 0
-            weapon_color = curses.color_pair(5) if curses.has_colors() else 0
-            potion_color = curses.color_pair(4) if curses.has_colors() else 0
-            default_color = curses.color_pair(1) if curses.has_colors() else 0
+            title_color = self.color_pairs[8]
+            gold_color = self.color_pairs[6]
+            weapon_color = self.color_pairs[5]
+            potion_color = self.color_pairs[4]
+            default_color = self.color_pairs[1]
             
             self.stdscr.addstr(0, 0, "=== INVENTORY ===", title_color)
             self.stdscr.addstr(1, 0, f"Gold: {self.dungeon.player.gold}", gold_color)
@@ -570,8 +714,8 @@ class Game:
             pass
     
     def handle_inventory_input(self, key):
-        if key >= ord('1') and key <= ord('9'):
-            index = key - ord('1')
+        if key in NUMBER_KEYS:
+            index = NUMBER_KEYS[key]
             if index < len(self.dungeon.player.inventory):
                 item = self.dungeon.player.inventory[index]
                 
@@ -652,13 +796,13 @@ class Game:
         self.dungeon = new_dungeon
     
     def draw_shop(self):
-        self.stdscr.clear()
+        self.stdscr.erase()
         try:
-            title_color = curses.color_pair(10) if curses.has_colors() else 0
-            gold_color = curses.color_pair(6) if curses.has_colors() else 0
-            weapon_color = curses.color_pair(5) if curses.has_colors() else 0
-            potion_color = curses.color_pair(4) if curses.has_colors() else 0
-            default_color = curses.color_pair(1) if curses.has_colors() else 0
+            title_color = self.color_pairs[10]
+            gold_color = self.color_pairs[6]
+            weapon_color = self.color_pairs[5]
+            potion_color = self.color_pairs[4]
+            default_color = self.color_pairs[1]
             
             self.stdscr.addstr(0, 0, "=== MYSTICAL SHOP ===", title_color)
             self.stdscr.addstr(1, 0, f"Your Gold: {self.dungeon.player.gold}", gold_color)
@@ -712,7 +856,7 @@ class Game:
             self.add_message("You don't know any spells!")
             return True
         
-        self.stdscr.clear()
+        self.stdscr.erase()
         
         try:
             title = "Cast Spell (ESC to cancel)"
@@ -744,8 +888,8 @@ class Game:
             if key == 27:  # ESC
                 return True
             
-            if key >= ord('1') and key <= ord('9'):
-                spell_index = key - ord('1')
+            if key in NUMBER_KEYS:
+                spell_index = NUMBER_KEYS[key]
                 if spell_index < len(available_spells):
                     spell, can_cast = available_spells[spell_index]
                     if can_cast:
@@ -790,8 +934,9 @@ class Game:
             # Calculate target position based on player facing direction
             if self.render_3d:
                 # In 3D mode, cast in facing direction
-                target_x = player.pos.x + int(round(math.cos(player.angle)))
-                target_y = player.pos.y + int(round(math.sin(player.angle)))
+                dx, dy = facing_step(player.angle)
+                target_x = player.pos.x + dx
+                target_y = player.pos.y + dy
             else:
                 # In 2D mode, default to 1 tile ahead (facing down)
                 target_x = player.pos.x
@@ -823,8 +968,8 @@ class Game:
             return True
         
         # Handle buying (1-9)
-        if key >= ord('1') and key <= ord('9'):
-            index = key - ord('1')
+        if key in NUMBER_KEYS:
+            index = NUMBER_KEYS[key]
             if index < len(self.shop.items):
                 item = self.shop.items[index]
                 if self.dungeon.player.gold >= item.value:
@@ -839,9 +984,8 @@ class Game:
                     self.add_message(f"Not enough gold! Need {item.value} gold.")
         
         # Handle selling (Shift+1-9, which are typically ! @ # $ % ^ & * ()
-        sell_keys = [ord('!'), ord('@'), ord('#'), ord('$'), ord('%'), ord('^'), ord('&'), ord('*'), ord('(')]
-        if key in sell_keys:
-            index = sell_keys.index(key)
+        if key in SELL_KEYS:
+            index = SELL_KEYS[key]
             if index < len(self.dungeon.player.inventory):
                 item = self.dungeon.player.inventory[index]
                 sell_price = max(1, item.value // 2)
@@ -886,44 +1030,59 @@ class Game:
         self.add_message("You grow stronger in body and mind! (+5 Max HP, +1 Attack)")
     
     def draw_levelup_screen(self):
-        self.stdscr.clear()
+        self.stdscr.erase()
+        
+        # The screen is static while the choice is pending, so its layout is only
+        # rebuilt for a new set of rewards or a new terminal size
+        height, width = self.stdscr.getmaxyx()
+        levelup_key = (height, width, self.dungeon.player.level, tuple(self.levelup_rewards))
+        if levelup_key != self._levelup_key:
+            self._levelup_key = levelup_key
+            self._levelup_lines = self.layout_levelup_screen(height, width)
+        
         try:
-            # Calculate center of screen
-            height, width = self.stdscr.getmaxyx()
-            center_y = height // 2
-            center_x = width // 2
-            
-            # Colors
-            level_color = curses.color_pair(6) if curses.has_colors() else 0  # Yellow
-            title_color = curses.color_pair(8) if curses.has_colors() else 0  # Magenta
-            option_color = curses.color_pair(1) if curses.has_colors() else 0  # White
-            
-            # Level up message
-            level_msg = f"LEVEL UP! You are now level {self.dungeon.player.level}!"
-            self.stdscr.addstr(center_y - 8, center_x - len(level_msg) // 2, level_msg, level_color | curses.A_BOLD)
-            
-            # Instruction
-            instruction = "Choose your reward:"
-            self.stdscr.addstr(center_y - 6, center_x - len(instruction) // 2, instruction, title_color)
-            
-            # Reward options
-            for i, reward in enumerate(self.levelup_rewards):
-                option_text = f"{i+1}) {reward.name}"
-                desc_text = f"   {reward.description}"
-                
-                self.stdscr.addstr(center_y - 4 + i * 2, center_x - 20, option_text, option_color | curses.A_BOLD)
-                self.stdscr.addstr(center_y - 3 + i * 2, center_x - 20, desc_text, option_color)
-            
-            # Bottom instruction
-            bottom_instruction = f"Press 1-{len(self.levelup_rewards)} to select your reward"
-            self.stdscr.addstr(center_y + 4, center_x - len(bottom_instruction) // 2, bottom_instruction, title_color)
-            
+            for y, x, text, attr in self._levelup_lines:
+                self.stdscr.addstr(y, x, text, attr)
         except curses.error:
             pass
     
+    def layout_levelup_screen(self, height, width):
+        """Build the level-up screen as (y, x, text, attr) lines"""
+        # Calculate center of screen
+        center_y = height // 2
+        center_x = width // 2
+        lines = []
+        
+        # Colors
+        level_color = self.color_pairs[6]  # Yellow
+        title_color = self.color_pairs[8]  # Magenta
+        option_color = self.color_pairs[1]  # White
+        
+        # Level up message
+        level_msg = f"LEVEL UP! You are now level {self.dungeon.player.level}!"
+        lines.append((center_y - 8, center_x - len(level_msg) // 2, level_msg, level_color | curses.A_BOLD))
+        
+        # Instruction
+        instruction = "Choose your reward:"
+        lines.append((center_y - 6, center_x - len(instruction) // 2, instruction, title_color))
+        
+        # Reward options
+        for i, reward in enumerate(self.levelup_rewards):
+            option_text = f"{i+1}) {reward.name}"
+            desc_text = f"   {reward.description}"
+            
+            lines.append((center_y - 4 + i * 2, center_x - 20, option_text, option_color | curses.A_BOLD))
+            lines.append((center_y - 3 + i * 2, center_x - 20, desc_text, option_color))
+        
+        # Bottom instruction
+        bottom_instruction = f"Press 1-{len(self.levelup_rewards)} to select your reward"
+        lines.append((center_y + 4, center_x - len(bottom_instruction) // 2, bottom_instruction, title_color))
+        
+        return lines
+    
     def handle_levelup_input(self, key):
-        if key >= ord('1') and key <= ord('9'):
-            index = key - ord('1')
+        if key in NUMBER_KEYS:
+            index = NUMBER_KEYS[key]
             if index < len(self.levelup_rewards):
                 # Apply the selected reward
                 reward = self.levelup_rewards[index]
@@ -937,44 +1096,59 @@ class Game:
         return True
     
     def draw_death_screen(self):
-        self.stdscr.clear()
+        self.stdscr.erase()
+        
+        # Only the final stats and terminal size change what is shown
+        height, width = self.stdscr.getmaxyx()
+        player = self.dungeon.player
+        death_key = (height, width, self.current_level, player.gold if player else None)
+        if death_key != self._death_key:
+            self._death_key = death_key
+            self._death_lines = self.layout_death_screen(height, width)
+        
         try:
-            # Calculate center of screen
-            height, width = self.stdscr.getmaxyx()
-            center_y = height // 2
-            center_x = width // 2
-            
-            # Colors
-            death_color = curses.color_pair(3) if curses.has_colors() else 0  # Red
-            title_color = curses.color_pair(8) if curses.has_colors() else 0  # Magenta
-            option_color = curses.color_pair(1) if curses.has_colors() else 0  # White
-            
-            # Death message
-            death_msg = "YOU HAVE DIED!"
-            self.stdscr.addstr(center_y - 6, center_x - len(death_msg) // 2, death_msg, death_color | curses.A_BOLD)
-            
-            # Game stats
-            level_msg = f"You reached level {self.current_level}"
-            self.stdscr.addstr(center_y - 4, center_x - len(level_msg) // 2, level_msg, title_color)
-            
-            if self.dungeon.player:
-                gold_msg = f"Final gold: {self.dungeon.player.gold}"
-                self.stdscr.addstr(center_y - 3, center_x - len(gold_msg) // 2, gold_msg, title_color)
-            
-            # Options
-            self.stdscr.addstr(center_y - 1, center_x - 10, "What would you like to do?", title_color)
-            
-            self.stdscr.addstr(center_y + 1, center_x - 12, "1) Restart from scratch", option_color)
-            self.stdscr.addstr(center_y + 2, center_x - 12, "2) Load saved game", option_color)
-            self.stdscr.addstr(center_y + 3, center_x - 12, "3) Quit to desktop", option_color)
-            
-            # Instructions
-            instruction = "Press 1, 2, or 3 to select an option"
-            self.stdscr.addstr(center_y + 5, center_x - len(instruction) // 2, instruction, title_color)
-            
+            for y, x, text, attr in self._death_lines:
+                self.stdscr.addstr(y, x, text, attr)
         except curses.error:
             pass
     
+    def layout_death_screen(self, height, width):
+        """Build the death screen as (y, x, text, attr) lines"""
+        # Calculate center of screen
+        center_y = height // 2
+        center_x = width // 2
+        lines = []
+        
+        # Colors
+        death_color = self.color_pairs[3]  # Red
+        title_color = self.color_pairs[8]  # Magenta
+        option_color = self.color_pairs[1]  # White
+        
+        # Death message
+        death_msg = "YOU HAVE DIED!"
+        lines.append((center_y - 6, center_x - len(death_msg) // 2, death_msg, death_color | curses.A_BOLD))
+        
+        # Game stats
+        level_msg = f"You reached level {self.current_level}"
+        lines.append((center_y - 4, center_x - len(level_msg) // 2, level_msg, title_color))
+        
+        if self.dungeon.player:
+            gold_msg = f"Final gold: {self.dungeon.player.gold}"
+            lines.append((center_y - 3, center_x - len(gold_msg) // 2, gold_msg, title_color))
+        
+        # Options
+        lines.append((center_y - 1, center_x - 10, "What would you like to do?", title_color))
+        
+        lines.append((center_y + 1, center_x - 12, "1) Restart from scratch", option_color))
+        lines.append((center_y + 2, center_x - 12, "2) Load saved game", option_color))
+        lines.append((center_y + 3, center_x - 12, "3) Quit to desktop", option_color))
+        
+        # Instructions
+        instruction = "Press 1, 2, or 3 to select an option"
+        lines.append((center_y + 5, center_x - len(instruction) // 2, instruction, title_color))
+        
+        return lines
+    
     def handle_death_screen_input(self, key):
         if key == ord('1'):
             # Restart from scratch
@@ -1001,7 +1175,7 @@ class Game:
     
     def restart_game(self):
         # Reset all game state
-        self.messages = []
+        self.messages.clear()
         self.game_over = False
         self.show_inventory = False
         self.in_shop = False
@@ -1019,7 +1193,9 @@ class Game:
     
     def run(self):
         while True:
-            self.draw()
+            if self.dirty:
+                self.draw()
+                self.dirty = False
             if not self.handle_input():
                 break
 